@@ -326,7 +326,11 @@ def main():
     logger.info("Events processed")
 
     logger.info("Entering main event loop...")
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    # Let background work such as the config save on close finish first.
+    from PySide6.QtCore import QThreadPool
+    QThreadPool.globalInstance().waitForDone()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
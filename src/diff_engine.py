@@ -12,6 +12,77 @@ import difflib
 import re
 
 
+# Block size used when scanning for a common prefix/suffix; slices of this
+# size are compared at C speed before falling back to per-item comparison.
+AFFIX_SCAN_CHUNK = 256
+
+
+def common_prefix_length(a, b) -> int:
+    """Return the length of the longest common prefix of two sequences.
+
+    Works on strings and lists alike.
+    """
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit:
+        j = min(i + AFFIX_SCAN_CHUNK, limit)
+        if a[i:j] != b[i:j]:
+            while a[i] == b[i]:
+                i += 1
+            return i
+        i = j
+    return limit
+
+
+def common_suffix_length(a, b, limit: Optional[int] = None) -> int:
+    """Return the length of the longest common suffix of two sequences.
+
+    Args:
+        a: First sequence
+        b: Second sequence
+        limit: Maximum suffix length to report, e.g. to keep the suffix
+            from overlapping an already matched prefix
+    """
+    max_length = min(len(a), len(b))
+    if limit is not None:
+        max_length = min(max_length, limit)
+    len_a = len(a)
+    len_b = len(b)
+    i = 0
+    while i < max_length:
+        j = min(i + AFFIX_SCAN_CHUNK, max_length)
+        if a[len_a - j:len_a - i] != b[len_b - j:len_b - i]:
+            while a[len_a - 1 - i] == b[len_b - 1 - i]:
+                i += 1
+            return i
+        i = j
+    return max_length
+
+
+def trimmed_opcodes(a, b) -> List[Tuple[str, int, int, int, int]]:
+    """Return SequenceMatcher opcodes for ``a`` and ``b``.
+
+    The common prefix and suffix are matched up front and only the
+    differing middle is handed to SequenceMatcher, which keeps localized
+    edits in large inputs cheap. Opcode indices refer to the full sequences.
+    """
+    prefix = common_prefix_length(a, b)
+    suffix = common_suffix_length(a, b, min(len(a), len(b)) - prefix)
+    end_a = len(a) - suffix
+    end_b = len(b) - suffix
+
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    if prefix < end_a or prefix < end_b:
+        matcher = difflib.SequenceMatcher(None, a[prefix:end_a], b[prefix:end_b])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", end_a, len(a), end_b, len(b)))
+    return opcodes
+
+
 class DiffType(Enum):
     """Types of differences in a diff operation."""
     EQUAL = "equal"
@@ -28,6 +99,15 @@ class IgnoreOptions:
     ignore_blank_lines: bool = False
     ignore_comments: bool = False
     
+    def as_tuple(self) -> Tuple[bool, bool, bool, bool]:
+        """Return the options as a hashable tuple, e.g. for cache keys."""
+        return (
+            self.ignore_whitespace,
+            self.ignore_case,
+            self.ignore_blank_lines,
+            self.ignore_comments,
+        )
+    
     def preprocess_line(self, line: str) -> str:
         """Preprocess a line based on ignore options."""
         if self.ignore_blank_lines and not line.strip():
@@ -86,6 +166,40 @@ class DiffResult:
     left_line_count: int
     right_line_count: int
     change_count: int
+    _line_indices: Optional[Dict[DiffType, List[int]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _change_indices: Optional[List[int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def _build_indices(self) -> None:
+        """Index the lines by type in a single pass."""
+        line_indices = {diff_type: [] for diff_type in DiffType}
+        for i, line in enumerate(self.lines):
+            line_indices[line.type].append(i)
+        self._line_indices = line_indices
+        self._change_indices = sorted(
+            line_indices[DiffType.INSERT] + line_indices[DiffType.DELETE]
+            + line_indices[DiffType.REPLACE]
+        )
+    
+    def indices_of(self, diff_type: DiffType) -> List[int]:
+        """Get the sorted indices of lines of one type.
+        
+        The index is built on first use and kept with the result, so cached
+        results do not need to be rescanned. The returned list must not be
+        modified.
+        """
+        if self._line_indices is None:
+            self._build_indices()
+        return self._line_indices[diff_type]
+    
+    def change_indices(self) -> List[int]:
+        """Get the sorted indices of all non-EQUAL lines."""
+        if self._change_indices is None:
+            self._build_indices()
+        return self._change_indices
     
     @classmethod
     def from_files(cls, left_lines: List[str], right_lines: List[str], 
@@ -95,13 +209,12 @@ class DiffResult:
             left_lines = [ignore_options.preprocess_line(line) for line in left_lines]
             right_lines = [ignore_options.preprocess_line(line) for line in right_lines]
         
-        matcher = difflib.SequenceMatcher(None, left_lines, right_lines)
         diff_lines = []
         left_count = 0
         right_count = 0
         change_count = 0
         
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in trimmed_opcodes(left_lines, right_lines):
             if tag == "equal":
                 for line in left_lines[i1:i2]:
                     diff_lines.append(DiffLine(
@@ -236,13 +349,27 @@ class DiffEngine:
 
         Returns a list of tuples: (text1_chunk, text2_chunk, diff_type)
         diff_type can be 'equal', 'insert', 'delete', or 'replace'
+
+        The common prefix and suffix are split off before running the
+        matcher, so a long line with a small edit only pays for the
+        differing middle.
         """
         char_diff = []
-        matcher = difflib.SequenceMatcher(None, text1, text2)
+        prefix = common_prefix_length(text1, text2)
+        suffix = common_suffix_length(text1, text2, min(len(text1), len(text2)) - prefix)
+        end1 = len(text1) - suffix
+        end2 = len(text2) - suffix
+
+        if prefix:
+            char_diff.append((text1[:prefix], text2[:prefix], "equal"))
+
+        middle1 = text1[prefix:end1]
+        middle2 = text2[prefix:end2]
+        matcher = difflib.SequenceMatcher(None, middle1, middle2)
 
         for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-            chunk1 = text1[i1:i2]
-            chunk2 = text2[j1:j2]
+            chunk1 = middle1[i1:i2]
+            chunk2 = middle2[j1:j2]
 
             if tag == "equal":
                 char_diff.append((chunk1, chunk2, "equal"))
@@ -253,6 +380,9 @@ class DiffEngine:
             elif tag == "replace":
                 char_diff.append((chunk1, chunk2, "replace"))
 
+        if suffix:
+            char_diff.append((text1[end1:], text2[end2:], "equal"))
+
         return char_diff
 
     @staticmethod
@@ -535,13 +665,12 @@ class InlineDiffResult:
             left_lines = [ignore_options.preprocess_line(line) for line in left_lines]
             right_lines = [ignore_options.preprocess_line(line) for line in right_lines]
         
-        matcher = difflib.SequenceMatcher(None, left_lines, right_lines)
         diff_lines = []
         left_count = 0
         right_count = 0
         change_count = 0
 
-        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        for tag, i1, i2, j1, j2 in trimmed_opcodes(left_lines, right_lines):
             if tag == "equal":
                 for line in left_lines[i1:i2]:
                     diff_lines.append(InlineDiffLine(
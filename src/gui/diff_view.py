@@ -4,25 +4,67 @@ Side-by-side diff view widget.
 Provides a synchronized view of two files with diff highlighting.
 """
 
+import bisect
+import collections
+import functools
+import hashlib
+import itertools
 import logging
+from datetime import datetime
 logger = logging.getLogger("MergeDiffTool.DiffView")
 
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QSplitter, QPlainTextEdit,
-    QScrollBar, QFrame, QTextEdit
+    QScrollBar, QFrame, QTextEdit, QFileDialog, QMessageBox, QProgressDialog
+)
+from PySide6.QtCore import (
+    Qt, Signal, QEvent, QSize, QTimer, QObject, QRunnable, QThreadPool, QFileDevice
 )
-from PySide6.QtCore import Qt, Signal, QEvent, QSize
 from PySide6.QtGui import (
     QTextCursor, QTextCharFormat, QColor, QFont,
-    QSyntaxHighlighter, QTextBlockUserData, QPainter
+    QSyntaxHighlighter, QTextBlock, QTextBlockUserData, QPainter
 )
 from src.diff_engine import DiffEngine, DiffResult, DiffType, InlineDiffResult, IgnoreOptions, LineAligner
-from src.utils.file_ops import UndoRedoManager
+from src.diff_engine import common_prefix_length, common_suffix_length
+from src.utils.file_ops import UndoRedoManager, write_file_direct
 from src.gui.syntax_highlighter import SyntaxHighlighter, detect_language_from_filename
 from src.gui.search_bar import SearchBar, SearchHelper
 from src.gui.connecting_lines import DiffConnectionLines
 from src.utils.report_generator import ReportGenerator
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
+
+
+# Files are streamed into the editors in blocks of this many characters so
+# that large files do not block the event loop while they load.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Number of recent diff results kept per view, so toggling ignore options
+# back and forth does not recompute the diff.
+DIFF_CACHE_SIZE = 16
+
+# Delay used to coalesce diff updates after copy-all and undo/redo.
+DIFF_UPDATE_DELAY_MS = 50
+
+# Export formats: format -> (generator, file dialog filter, extension,
+# whether the generator needs the left/right text).
+REPORT_FORMATS = {
+    "html": (ReportGenerator.generate_html_report, "HTML Report (*.html)", ".html", True),
+    "text": (ReportGenerator.generate_text_report, "Text Report (*.txt)", ".txt", False),
+    "unified": (ReportGenerator.generate_unified_diff_report,
+                "Unified Diff (*.diff)", ".diff", True),
+    "json": (ReportGenerator.generate_json_report, "JSON Report (*.json)", ".json", False),
+}
+
+# Number of generated reports kept per view, so exporting the same diff
+# again (e.g. to another file) skips report generation.
+REPORT_CACHE_SIZE = 4
+
+# Background colors for whole changed lines in side-by-side mode.
+DIFF_LINE_COLORS = {
+    DiffType.INSERT: QColor("#e6ffed"),
+    DiffType.DELETE: QColor("#ffeef0"),
+    DiffType.REPLACE: QColor("#fff5b1"),
+}
 
 
 class LineNumberArea(QWidget):
@@ -57,6 +99,16 @@ class InlineDiffHighlighter(QSyntaxHighlighter):
         self.inline_diff_result = inline_diff_result
         self._enabled = True
 
+        self._delete_format = QTextCharFormat()
+        self._delete_format.setBackground(self.INLINE_DELETE_COLOR)
+        self._delete_format.setFontUnderline(True)
+        self._delete_format.setUnderlineColor(QColor("#ff0000"))
+
+        self._insert_format = QTextCharFormat()
+        self._insert_format.setBackground(self.INLINE_INSERT_COLOR)
+        self._insert_format.setFontUnderline(True)
+        self._insert_format.setUnderlineColor(QColor("#00aa00"))
+
     def setEnabled(self, enabled: bool):
         """Enable or disable the highlighter."""
         self._enabled = enabled
@@ -67,9 +119,34 @@ class InlineDiffHighlighter(QSyntaxHighlighter):
         return self._enabled
 
     def set_inline_diff_result(self, inline_diff_result: InlineDiffResult):
-        """Set the inline diff result to highlight."""
+        """Set the inline diff result to highlight.
+
+        Only blocks whose diff line changed since the previous result are
+        re-highlighted; a full pass is used for the first result or when
+        most lines changed.
+        """
+        old_lines = self.inline_diff_result.lines if self.inline_diff_result else None
         self.inline_diff_result = inline_diff_result
-        self.rehighlight()
+        if old_lines is None or inline_diff_result is None:
+            self.rehighlight()
+            return
+
+        new_lines = inline_diff_result.lines
+        changed = [
+            index for index, (old, new) in enumerate(
+                itertools.zip_longest(old_lines, new_lines))
+            if old != new
+        ]
+        document = self.document()
+        if len(changed) * 2 > document.blockCount():
+            self.rehighlight()
+            return
+
+        for index in changed:
+            block = document.findBlockByNumber(index)
+            if not block.isValid():
+                break
+            self.rehighlightBlock(block)
 
     def highlightBlock(self, text: str):
         """Highlight a block with inline character-level diffs."""
@@ -83,20 +160,8 @@ class InlineDiffHighlighter(QSyntaxHighlighter):
 
         line = lines[block_num]
 
-        if line.diff_type == DiffType.INSERT:
-            delete_fmt = QTextCharFormat()
-            delete_fmt.setBackground(self.INLINE_DELETE_COLOR)
-            delete_fmt.setFontUnderline(True)
-            delete_fmt.setUnderlineColor(QColor("#ff0000"))
-            self.setFormat(0, len(text), delete_fmt)
-            return
-
-        if line.diff_type == DiffType.DELETE:
-            delete_fmt = QTextCharFormat()
-            delete_fmt.setBackground(self.INLINE_DELETE_COLOR)
-            delete_fmt.setFontUnderline(True)
-            delete_fmt.setUnderlineColor(QColor("#ff0000"))
-            self.setFormat(0, len(text), delete_fmt)
+        if line.diff_type in (DiffType.INSERT, DiffType.DELETE):
+            self.setFormat(0, len(text), self._delete_format)
             return
 
         if line.diff_type == DiffType.REPLACE:
@@ -122,27 +187,34 @@ class InlineDiffHighlighter(QSyntaxHighlighter):
             delete_ranges = self._merge_ranges(delete_ranges)
             insert_ranges = self._merge_ranges(insert_ranges)
 
-            for start, end in delete_ranges:
-                if start < len(text):
-                    actual_start = min(start, len(text))
-                    actual_end = min(end, len(text))
-                    if actual_start < actual_end:
-                        fmt = QTextCharFormat()
-                        fmt.setBackground(self.INLINE_DELETE_COLOR)
-                        fmt.setFontUnderline(True)
-                        fmt.setUnderlineColor(QColor("#ff0000"))
-                        self.setFormat(actual_start, actual_end - actual_start, fmt)
-
-            for start, end in insert_ranges:
-                if start < len(text):
-                    actual_start = min(start, len(text))
-                    actual_end = min(end, len(text))
-                    if actual_start < actual_end:
-                        fmt = QTextCharFormat()
-                        fmt.setBackground(self.INLINE_INSERT_COLOR)
-                        fmt.setFontUnderline(True)
-                        fmt.setUnderlineColor(QColor("#00aa00"))
-                        self.setFormat(actual_start, actual_end - actual_start, fmt)
+            for start, length, kind in self._format_runs(len(text), delete_ranges, insert_ranges):
+                fmt = self._insert_format if kind == DiffType.INSERT else self._delete_format
+                self.setFormat(start, length, fmt)
+
+    @staticmethod
+    def _format_runs(text_length: int, delete_ranges: List[Tuple[int, int]],
+                     insert_ranges: List[Tuple[int, int]]) -> List[Tuple[int, int, DiffType]]:
+        """Flatten delete/insert ranges into maximal runs of one format.
+
+        Insert ranges are painted over delete ranges, as when each range
+        was applied with its own setFormat() call, so every returned
+        (start, length, kind) run needs exactly one setFormat().
+        """
+        kinds = [None] * text_length
+        for ranges, kind in ((delete_ranges, DiffType.DELETE), (insert_ranges, DiffType.INSERT)):
+            for start, end in ranges:
+                end = min(end, text_length)
+                if start < end:
+                    kinds[start:end] = [kind] * (end - start)
+
+        runs = []
+        pos = 0
+        for kind, group in itertools.groupby(kinds):
+            run_length = sum(1 for _ in group)
+            if kind is not None:
+                runs.append((pos, run_length, kind))
+            pos += run_length
+        return runs
 
     def _merge_ranges(self, ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """Merge overlapping or adjacent ranges."""
@@ -162,71 +234,57 @@ class InlineDiffHighlighter(QSyntaxHighlighter):
         return merged
 
 
-class DiffHighlighter(QSyntaxHighlighter):
-    """Syntax highlighter for diff output."""
+class InlineDiffSignals(QObject):
+    """Signals emitted by InlineDiffWorker."""
 
-    COLORS = {
-        DiffType.EQUAL: QColor("#ffffff"),
-        DiffType.INSERT: QColor("#e6ffed"),
-        DiffType.DELETE: QColor("#ffeef0"),
-        DiffType.REPLACE: QColor("#fff5b1"),
-    }
+    finished = Signal(int, object)
 
-    def __init__(self, document, diff_result: DiffResult = None):
-        super().__init__(document)
-        self.diff_result = diff_result
-        self._inline_mode = False
-        self._inline_result = None
-        self._enabled = True
 
-    def setEnabled(self, enabled: bool):
-        """Enable or disable the highlighter."""
-        self._enabled = enabled
-        self.rehighlight()
+class InlineDiffWorker(QRunnable):
+    """Compute an InlineDiffResult on a thread pool thread.
 
-    def isEnabled(self) -> bool:
-        """Check if the highlighter is enabled."""
-        return self._enabled
+    The result is delivered through ``signals.finished`` together with the
+    generation it was requested for, so the receiver can drop stale results.
+    """
 
-    def set_diff_result(self, diff_result: DiffResult):
-        """Set the diff result to highlight."""
-        self.diff_result = diff_result
-        self._inline_mode = False
-        self.rehighlight()
+    def __init__(self, generation: int, left_content: str, right_content: str):
+        super().__init__()
+        self.signals = InlineDiffSignals()
+        self._generation = generation
+        self._left_content = left_content
+        self._right_content = right_content
 
-    def set_inline_diff_result(self, inline_result: InlineDiffResult):
-        """Set the inline diff result for character-level highlighting."""
-        self._inline_result = inline_result
-        self._inline_mode = True
-        self.rehighlight()
+    def run(self):
+        result = InlineDiffResult.from_text(self._left_content, self._right_content)
+        self.signals.finished.emit(self._generation, result)
 
-    def set_inline_mode(self, enabled: bool):
-        """Enable or disable inline character-level diff mode."""
-        self._inline_mode = enabled
-        self.rehighlight()
 
-    def is_inline_mode(self) -> bool:
-        """Check if inline mode is enabled."""
-        return self._inline_mode
+class ReportSignals(QObject):
+    """Signals emitted by ReportWorker."""
 
-    def highlightBlock(self, text: str):
-        """Highlight a block of text based on diff type."""
-        if self._inline_mode and self._inline_result:
-            return
+    generated = Signal(str)
+    finished = Signal(str, bool)
+    failed = Signal(str)
 
-        if not self._enabled or not self.diff_result:
-            return
 
-        block_num = self.currentBlock().blockNumber()
-        lines = self.diff_result.lines
-        if block_num >= len(lines):
-            return
+class ReportWorker(QRunnable):
+    """Generate a diff report and save it on a thread pool thread."""
 
-        line = lines[block_num]
-        if line.type != DiffType.EQUAL:
-            fmt = QTextCharFormat()
-            fmt.setBackground(self.COLORS.get(line.type, self.COLORS[DiffType.EQUAL]))
-            self.setFormat(0, len(text), fmt)
+    def __init__(self, generate: Callable[[], str], file_path: str):
+        super().__init__()
+        self.signals = ReportSignals()
+        self._generate = generate
+        self._file_path = file_path
+
+    def run(self):
+        try:
+            report = self._generate()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.generated.emit(report)
+        saved = ReportGenerator.save_report(report, self._file_path)
+        self.signals.finished.emit(self._file_path, saved)
 
 
 class DiffTextEdit(QPlainTextEdit):
@@ -239,6 +297,11 @@ class DiffTextEdit(QPlainTextEdit):
         self.updateRequest.connect(self.update_line_number_area)
         self.cursorPositionChanged.connect(self.highlight_current_line)
         self.syntax_highlighter = None
+        self._diff_selections = []
+        self._column_selections = []
+        self._blocks = []
+        self._blocks_revision = -1
+        self._update_font_metrics()
 
         self._column_mode = False
         self._column_selection_start = None
@@ -336,7 +399,8 @@ class DiffTextEdit(QPlainTextEdit):
                 selection.cursor.setPosition(block.position() + col_end, QTextCursor.KeepAnchor)
                 extra_selections.append(selection)
 
-        self.setExtraSelections(extra_selections)
+        self._column_selections = extra_selections
+        self._refresh_extra_selections()
 
     def insert_column_text(self, text: str):
         """Insert text at column selection across multiple lines."""
@@ -378,7 +442,8 @@ class DiffTextEdit(QPlainTextEdit):
             self.setPlainText('\n'.join(lines[:min(start_line, end_line)] + new_content + lines[max(start_line, end_line) + 1:]))
             self._column_selection_start = None
             self._column_selection_end = None
-            self.setExtraSelections([])
+            self._column_selections = []
+            self._refresh_extra_selections()
 
     def keyPressEvent(self, event):
         """Handle key press event for column edit mode."""
@@ -420,10 +485,23 @@ class DiffTextEdit(QPlainTextEdit):
         else:
             super().dropEvent(event)
 
+    def _update_font_metrics(self):
+        """Cache the font measurements used by the line number area."""
+        metrics = self.fontMetrics()
+        self._digit_width = metrics.horizontalAdvance("9")
+        self._font_height = metrics.height()
+
+    def changeEvent(self, event):
+        """Refresh cached font metrics when the font changes."""
+        if event.type() == QEvent.FontChange:
+            self._update_font_metrics()
+            self.update_line_number_area_width(0)
+        super().changeEvent(event)
+
     def line_number_area_width(self):
         """Calculate the width needed for line numbers."""
         digits = len(str(self.blockCount())) or 1
-        return self.fontMetrics().horizontalAdvance("9") * digits + 10
+        return self._digit_width * digits + 10
 
     def update_line_number_area_width(self, _):
         self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
@@ -441,19 +519,23 @@ class DiffTextEdit(QPlainTextEdit):
         """Paint the line number area."""
         painter = QPainter(self.line_number_area)
         painter.fillRect(event.rect(), Qt.lightGray)
+        painter.setPen(Qt.black)
+
+        text_width = self.line_number_area.width() - 5
+        font_height = self._font_height
+        rect_top = event.rect().top()
+        rect_bottom = event.rect().bottom()
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + int(self.blockBoundingRect(block).height())
 
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
+        while block.isValid() and top <= rect_bottom:
+            if block.isVisible() and bottom >= rect_top:
                 number = str(block_number + 1)
-                painter.setPen(Qt.black)
                 painter.drawText(
-                    0, top, self.line_number_area.width() - 5,
-                    self.fontMetrics().height(),
+                    0, top, text_width, font_height,
                     Qt.AlignRight, number
                 )
 
@@ -462,9 +544,37 @@ class DiffTextEdit(QPlainTextEdit):
             bottom = top + int(self.blockBoundingRect(block).height())
             block_number += 1
 
+    def blocks(self) -> List[QTextBlock]:
+        """Return all blocks of the document, indexable by block number.
+
+        The list is rebuilt with a single firstBlock()/next() walk only
+        when the document revision changes, replacing repeated
+        findBlockByNumber() lookups.
+        """
+        document = self.document()
+        revision = document.revision()
+        if revision != self._blocks_revision:
+            blocks = []
+            block = document.firstBlock()
+            while block.isValid():
+                blocks.append(block)
+                block = block.next()
+            self._blocks = blocks
+            self._blocks_revision = revision
+        return self._blocks
+
+    def set_diff_selections(self, selections: List[QTextEdit.ExtraSelection]):
+        """Set the changed-line highlights drawn beneath the current line."""
+        self._diff_selections = selections
+        self._refresh_extra_selections()
+
     def highlight_current_line(self):
         """Highlight the current line."""
-        extra_selections = []
+        self._refresh_extra_selections()
+
+    def _refresh_extra_selections(self):
+        """Combine diff, current-line and column selections into one list."""
+        extra_selections = list(self._diff_selections)
 
         if not self.isReadOnly():
             selection = QTextEdit.ExtraSelection()
@@ -475,6 +585,7 @@ class DiffTextEdit(QPlainTextEdit):
             selection.cursor.clearSelection()
             extra_selections.append(selection)
 
+        extra_selections.extend(self._column_selections)
         self.setExtraSelections(extra_selections)
 
     def resizeEvent(self, event):
@@ -497,16 +608,32 @@ class DiffView(QWidget):
         self._left_file_path = None
         self._right_file_path = None
         self._diff_result = None
+        self._change_indices = []
         self._inline_diff_result = None
-        self._left_content = ""
-        self._right_content = ""
+        self._left_content_cache = ""
+        self._right_content_cache = ""
+        self._left_lines_cache = None
+        self._right_lines_cache = None
+        self._left_edited = False
+        self._right_edited = False
+        self._right_line_offsets_cache = None
         self._merged_content = ""
         self._inline_mode = False
         self._undo_manager = UndoRedoManager()
         self._is_undo_redo_operation = False
+        self._is_programmatic_edit = False
         self._ignore_options = IgnoreOptions()
         self._diff_engine = DiffEngine(self._ignore_options)
         self._connecting_lines_enabled = False
+        self._file_streams = {}
+        self._diff_cache = collections.OrderedDict()
+        self._inline_generation = 0
+        self._diff_pending = False
+        self._report_worker = None
+        self._report_progress = None
+        self._report_cache = collections.OrderedDict()
+        self._diff_aligned = False
+        self._inline_worker = None
 
         logger.debug("Calling _setup_ui...")
         self._setup_ui()
@@ -537,7 +664,6 @@ class DiffView(QWidget):
         left_layout.setContentsMargins(0, 0, 0, 0)
         self.left_editor = DiffTextEdit()
         self.left_editor.setReadOnly(False)
-        self.left_highlighter = DiffHighlighter(self.left_editor.document())
         self.left_inline_highlighter = InlineDiffHighlighter(self.left_editor.document())
         left_layout.addWidget(self.left_editor)
         splitter.addWidget(left_frame)
@@ -547,7 +673,6 @@ class DiffView(QWidget):
         right_layout.setContentsMargins(0, 0, 0, 0)
         self.right_editor = DiffTextEdit()
         self.right_editor.setReadOnly(False)
-        self.right_highlighter = DiffHighlighter(self.right_editor.document())
         self.right_inline_highlighter = InlineDiffHighlighter(self.right_editor.document())
         right_layout.addWidget(self.right_editor)
         splitter.addWidget(right_frame)
@@ -570,6 +695,12 @@ class DiffView(QWidget):
         self.right_editor.verticalScrollBar().valueChanged.connect(
             self._sync_scroll
         )
+        self.left_editor.document().contentsChange.connect(
+            self._on_left_contents_change
+        )
+        self.right_editor.document().contentsChange.connect(
+            self._on_right_contents_change
+        )
         self.left_editor.textChanged.connect(self._on_left_content_changed)
         self.right_editor.textChanged.connect(self._on_right_content_changed)
         
@@ -578,25 +709,159 @@ class DiffView(QWidget):
         self.search_bar.replace_all_requested.connect(self._on_replace_all)
         self.search_bar.close_requested.connect(self._hide_search_bar)
 
+    @property
+    def _left_content(self) -> str:
+        """Text of the left editor, read from the document only when stale."""
+        if self._left_content_cache is None:
+            self._left_content_cache = self.left_editor.toPlainText()
+        return self._left_content_cache
+
+    @_left_content.setter
+    def _left_content(self, content: Optional[str]):
+        """Set the cached text; None marks it stale."""
+        self._left_content_cache = content
+        self._left_lines_cache = None
+
+    @property
+    def _right_content(self) -> str:
+        """Text of the right editor, read from the document only when stale."""
+        if self._right_content_cache is None:
+            self._right_content_cache = self.right_editor.toPlainText()
+        return self._right_content_cache
+
+    @_right_content.setter
+    def _right_content(self, content: Optional[str]):
+        """Set the cached text; None marks it stale."""
+        self._right_content_cache = content
+        self._right_lines_cache = None
+        self._right_line_offsets_cache = None
+
+    @property
+    def _left_lines(self) -> List[str]:
+        """Left text split on newlines, cached until the text changes."""
+        if self._left_lines_cache is None:
+            self._left_lines_cache = self._left_content.split('\n')
+        return self._left_lines_cache
+
+    @property
+    def _right_lines(self) -> List[str]:
+        """Right text split on newlines, cached until the text changes."""
+        if self._right_lines_cache is None:
+            self._right_lines_cache = self._right_content.split('\n')
+        return self._right_lines_cache
+
+    @property
+    def _right_line_offsets(self) -> List[int]:
+        """Start offset of each right line in the right text."""
+        if self._right_line_offsets_cache is None:
+            self._right_line_offsets_cache = list(itertools.accumulate(
+                (len(line) + 1 for line in self._right_lines[:-1]), initial=0
+            ))
+        return self._right_line_offsets_cache
+
+    def _right_content_with_line(self, index: int, line: str) -> str:
+        """Return the right text with line ``index`` replaced by ``line``."""
+        start = self._right_line_offsets[index]
+        end = start + len(self._right_lines[index])
+        content = self._right_content
+        return content[:start] + line + content[end:]
+
+    def _is_tracking_edits(self, side: str) -> bool:
+        """Check if text changes on ``side`` should be recorded as edits."""
+        return not (self._is_undo_redo_operation
+                    or self._is_programmatic_edit
+                    or side in self._file_streams)
+
+    @staticmethod
+    def _patched_text(editor: QPlainTextEdit, cached: Optional[str], position: int,
+                      removed: int, added: int) -> Optional[Tuple[str, bool]]:
+        """Apply a contentsChange to the cached text of ``editor``.
+
+        Only the added span is read back from the document, instead of the
+        whole text via toPlainText(). Returns the new text and whether it
+        differs from ``cached``, or None when the change cannot be patched
+        in: document positions count UTF-16 code units, so this is limited to
+        ASCII text, where they match str indices.
+        """
+        if cached is None or not cached.isascii():
+            return None
+        document = editor.document()
+        text_length = document.characterCount() - 1
+        if position + removed > len(cached) or position + added > text_length:
+            return None
+
+        cursor = QTextCursor(document)
+        cursor.setPosition(position)
+        cursor.setPosition(position + added, QTextCursor.KeepAnchor)
+        inserted = cursor.selectedText().replace("\u2029", "\n")
+        if not inserted.isascii():
+            return None
+
+        patched = cached[:position] + inserted + cached[position + removed:]
+        if len(patched) != text_length:
+            return None
+        return patched, inserted != cached[position:position + removed]
+
+    def _on_left_contents_change(self, position: int, removed: int, added: int):
+        """Keep the cached left text in sync with a real content edit."""
+        if not self._is_tracking_edits("left"):
+            return
+        result = self._patched_text(
+            self.left_editor, self._left_content_cache, position, removed, added
+        )
+        if result is None:
+            self._left_content = None
+            self._left_edited = True
+        elif result[1]:
+            self._left_content = result[0]
+            self._left_edited = True
+
+    def _on_right_contents_change(self, position: int, removed: int, added: int):
+        """Keep the cached right text in sync with a real content edit."""
+        if not self._is_tracking_edits("right"):
+            return
+        result = self._patched_text(
+            self.right_editor, self._right_content_cache, position, removed, added
+        )
+        if result is None:
+            self._right_content = None
+            self._right_edited = True
+        elif result[1]:
+            self._right_content = result[0]
+            self._right_edited = True
+
     def _on_left_content_changed(self):
         """Handle left content changes."""
-        if self._is_undo_redo_operation:
+        # textChanged also fires for highlighter re-formatting passes, which
+        # do not go through contentsChange and leave the text untouched.
+        if not self._is_tracking_edits("left") or not self._left_edited:
             return
-        new_content = self.left_editor.toPlainText()
-        if new_content != self._left_content:
-            self._left_content = new_content
-            self._create_snapshot("Edit Left")
-            self.content_changed.emit()
+        self._left_edited = False
+        self._create_snapshot("Edit Left")
+        self.content_changed.emit()
 
     def _on_right_content_changed(self):
         """Handle right content changes."""
-        if self._is_undo_redo_operation:
+        if not self._is_tracking_edits("right") or not self._right_edited:
             return
-        new_content = self.right_editor.toPlainText()
-        if new_content != self._right_content:
-            self._right_content = new_content
-            self._create_snapshot("Edit Right")
-            self.content_changed.emit()
+        self._right_edited = False
+        self._create_snapshot("Edit Right")
+        self.content_changed.emit()
+
+    def _set_editor_text(self, side: str, content: str):
+        """Replace the text of one editor without recording it as an edit."""
+        self._is_programmatic_edit = True
+        try:
+            if side == "left":
+                old_content = self._left_content
+                self._left_content = content
+                self._splice_editor_text(self.left_editor, old_content, content)
+            else:
+                old_content = self._right_content
+                self._right_content = content
+                self._splice_editor_text(self.right_editor, old_content, content)
+        finally:
+            self._is_programmatic_edit = False
 
     def _create_snapshot(self, description: str):
         """Create a snapshot for undo/redo."""
@@ -625,67 +890,154 @@ class DiffView(QWidget):
         else:
             self.left_editor.verticalScrollBar().setValue(value)
 
+    def _stream_file(self, side: str, file_path: str,
+                     on_finished: Callable[[Optional[str]], None]):
+        """Load a file into the editor for ``side`` without blocking the UI.
+
+        The file is read in STREAM_CHUNK_SIZE blocks, one block per event
+        loop iteration, and appended at the end of the document. The editor
+        is read-only until the load ends. ``on_finished`` receives the full
+        text once EOF is reached, an empty string if the file could not be
+        read (the error is reported in a message box), or None if the load
+        was superseded by another one for the same side.
+        """
+        editor = self.left_editor if side == "left" else self.right_editor
+        self._cancel_file_stream(side)
+
+        timer = QTimer(self)
+        timer.setInterval(0)
+        document = editor.document()
+        document.setUndoRedoEnabled(False)
+        was_read_only = editor.isReadOnly()
+        editor.setReadOnly(True)
+
+        parts = []
+        f = None
+
+        def finish(content: Optional[str], error: Optional[Exception] = None):
+            timer.stop()
+            timer.deleteLater()
+            if f is not None:
+                f.close()
+            if error is not None:
+                editor.clear()
+            document.setUndoRedoEnabled(True)
+            editor.setReadOnly(was_read_only)
+            del self._file_streams[side]
+            if error is not None:
+                QMessageBox.critical(self, "Error", f"Failed to read {file_path}:\n{error}")
+            on_finished(content)
+
+        # Registered before the editor is cleared, so the clear and the
+        # appended chunks are not recorded as user edits.
+        self._file_streams[side] = finish
+        editor.clear()
+
+        try:
+            f = open(file_path, "r", encoding="utf-8", errors="replace")
+        except Exception as e:
+            finish("", e)
+            return
+
+        def read_chunk():
+            try:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+            except Exception as e:
+                finish("", e)
+                return
+
+            if not chunk:
+                finish("".join(parts))
+                return
+
+            parts.append(chunk)
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(chunk)
+
+        timer.timeout.connect(read_chunk)
+        timer.start()
+
+    def _cancel_file_stream(self, side: str):
+        """Stop an in-progress file load for ``side``, if any."""
+        finish = self._file_streams.get(side)
+        if finish is not None:
+            finish(None)
+
     def set_left_file(self, file_path: str):
         """Set the left file to display."""
         self._left_file_path = file_path
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                self._left_content = f.read()
-            self.left_editor.setPlainText(self._left_content)
-            language = detect_language_from_filename(file_path)
-            self.left_editor.set_syntax_highlighting(language)
+        language = detect_language_from_filename(file_path)
+        self.left_editor.set_syntax_highlighting(language)
+        self._stream_file("left", file_path, self._on_left_file_loaded)
+
+    def _on_left_file_loaded(self, content: Optional[str]):
+        """Handle the left file finishing loading."""
+        if content is None:
+            return
+        self._left_content = content
+        if not self._file_streams:
             self._update_diff()
-        except Exception as e:
-            self.left_editor.setPlainText(f"Error reading file: {e}")
 
     def set_right_file(self, file_path: str):
         """Set the right file to display."""
         self._right_file_path = file_path
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
-                self._right_content = f.read()
-            self.right_editor.setPlainText(self._right_content)
-            language = detect_language_from_filename(file_path)
-            self.right_editor.set_syntax_highlighting(language)
+        language = detect_language_from_filename(file_path)
+        self.right_editor.set_syntax_highlighting(language)
+        self._stream_file("right", file_path, self._on_right_file_loaded)
+
+    def _on_right_file_loaded(self, content: Optional[str]):
+        """Handle the right file finishing loading."""
+        if content is None:
+            return
+        self._right_content = content
+        if not self._file_streams:
             self._update_diff()
-        except Exception as e:
-            self.right_editor.setPlainText(f"Error reading file: {e}")
 
     def compare_files(self, left_path: str, right_path: str):
-        """Compare two files."""
+        """Compare two files.
+
+        Both files are streamed in concurrently; the diff is computed once
+        the second one has finished loading. ``file_loaded`` is emitted when
+        both loads have ended, even if one failed or was superseded by a
+        later load, so callers waiting for it are always released.
+        """
         self._left_file_path = left_path
         self._right_file_path = right_path
 
-        try:
-            with open(left_path, "r", encoding="utf-8", errors="replace") as f:
-                self._left_content = f.read()
-        except Exception as e:
-            self._left_content = f"Error reading file: {e}"
+        pending = {"left", "right"}
+        superseded = []
 
-        try:
-            with open(right_path, "r", encoding="utf-8", errors="replace") as f:
-                self._right_content = f.read()
-        except Exception as e:
-            self._right_content = f"Error reading file: {e}"
+        def on_loaded(side: str, content: Optional[str]):
+            if content is None:
+                superseded.append(side)
+            elif side == "left":
+                self._left_content = content
+            else:
+                self._right_content = content
+            pending.discard(side)
+            if not pending:
+                if not superseded:
+                    self._update_diff()
+                self.file_loaded.emit(left_path, right_path)
 
-        self.left_editor.setPlainText(self._left_content)
-        self.right_editor.setPlainText(self._right_content)
+        def on_left_loaded(content: Optional[str]):
+            on_loaded("left", content)
 
-        self._update_diff()
+        def on_right_loaded(content: Optional[str]):
+            on_loaded("right", content)
 
-        self.file_loaded.emit(left_path, right_path)
+        self._stream_file("left", left_path, on_left_loaded)
+        self._stream_file("right", right_path, on_right_loaded)
 
     def _update_diff(self):
         """Update the diff highlighting."""
         if not self._left_content or not self._right_content:
             return
 
-        self._diff_result = self._diff_engine.compare_text(
-            self._left_content, self._right_content
-        )
+        self._set_diff_result(self._compute_diff_result())
 
-        self.left_highlighter.set_diff_result(self._diff_result)
-        self.right_highlighter.set_diff_result(self._diff_result)
+        self._update_diff_selections()
 
         self.connection_lines.set_diff_result(self._diff_result)
         self._update_connection_lines()
@@ -693,26 +1045,80 @@ class DiffView(QWidget):
         if self._inline_mode:
             self._update_inline_diff()
 
-    def _update_connection_lines(self):
-        """Update connecting lines positions."""
-        left_positions = []
-        right_positions = []
-        left_heights = []
-        right_heights = []
+    def _update_diff_selections(self):
+        """Highlight changed lines in both editors using extra selections.
+
+        Line-level highlighting is hidden while inline mode is active, where
+        the inline highlighter takes over.
+        """
+        for editor in (self.left_editor, self.right_editor):
+            if self._inline_mode or not self._diff_result:
+                editor.set_diff_selections([])
+                continue
+
+            blocks = editor.blocks()
+            selections = []
+            for i, line in enumerate(self._diff_result.lines):
+                if line.type == DiffType.EQUAL:
+                    continue
+                if i >= len(blocks):
+                    break
+                block = blocks[i]
+                selection = QTextEdit.ExtraSelection()
+                selection.format.setBackground(DIFF_LINE_COLORS[line.type])
+                selection.format.setProperty(QTextCharFormat.FullWidthSelection, True)
+                selection.cursor = QTextCursor(block)
+                selections.append(selection)
+            editor.set_diff_selections(selections)
+
+    def _content_digests(self) -> Tuple[bytes, bytes]:
+        """Return short hashes of the left and right text."""
+        return (
+            hashlib.blake2b(self._left_content.encode("utf-8", "surrogatepass"),
+                            digest_size=16).digest(),
+            hashlib.blake2b(self._right_content.encode("utf-8", "surrogatepass"),
+                            digest_size=16).digest(),
+        )
+
+    def _compute_diff_result(self) -> DiffResult:
+        """Return the diff of the current contents, reusing cached results."""
+        key = self._content_digests() + (self._ignore_options.as_tuple(),)
+        diff_result = self._diff_cache.get(key)
+        if diff_result is not None:
+            self._diff_cache.move_to_end(key)
+            return diff_result
 
-        for i in range(self.left_editor.blockCount()):
-            block = self.left_editor.document().findBlockByNumber(i)
-            left_positions.append(self.left_editor.blockBoundingGeometry(block).y())
-            left_heights.append(self.left_editor.blockBoundingRect(block).height())
+        diff_result = self._diff_engine.compare_text(
+            self._left_content, self._right_content
+        )
+        self._diff_cache[key] = diff_result
+        if len(self._diff_cache) > DIFF_CACHE_SIZE:
+            self._diff_cache.popitem(last=False)
+        return diff_result
 
-        for i in range(self.right_editor.blockCount()):
-            block = self.right_editor.document().findBlockByNumber(i)
-            right_positions.append(self.right_editor.blockBoundingGeometry(block).y())
-            right_heights.append(self.right_editor.blockBoundingRect(block).height())
+    def _update_connection_lines(self):
+        """Update connecting lines positions."""
+        left_positions, left_heights = self._block_geometries(self.left_editor)
+        right_positions, right_heights = self._block_geometries(self.right_editor)
 
         self.connection_lines.update_line_positions(left_positions, right_positions)
         self.connection_lines.update_line_heights(left_heights, right_heights)
 
+    @staticmethod
+    def _block_geometries(editor: DiffTextEdit) -> Tuple[List[float], List[float]]:
+        """Return the y position and height of every block in ``editor``.
+
+        blockBoundingGeometry() already carries the block height, so one
+        layout query per block yields both values.
+        """
+        positions = []
+        heights = []
+        for block in editor.blocks():
+            geometry = editor.blockBoundingGeometry(block)
+            positions.append(geometry.y())
+            heights.append(geometry.height())
+        return positions, heights
+
     def set_connecting_lines_enabled(self, enabled: bool):
         """Enable or disable connecting lines."""
         self._connecting_lines_enabled = enabled
@@ -742,19 +1148,44 @@ class DiffView(QWidget):
         self._diff_engine.set_ignore_options(self._ignore_options)
         self._update_diff()
 
+    def _schedule_diff_update(self):
+        """Run _update_diff once after a burst of programmatic changes.
+
+        Calls made within DIFF_UPDATE_DELAY_MS of each other, such as
+        repeated undo/redo, collapse into a single diff computation.
+        """
+        if self._diff_pending:
+            return
+        self._diff_pending = True
+        QTimer.singleShot(DIFF_UPDATE_DELAY_MS, self._run_diff_update)
+
+    def _run_diff_update(self):
+        """Run a diff update requested by _schedule_diff_update."""
+        self._diff_pending = False
+        self._update_diff()
+
+    def _set_diff_result(self, diff_result: DiffResult, aligned: bool = False):
+        """Store a new diff result and the line indices used for navigation."""
+        self._diff_result = diff_result
+        self._diff_aligned = aligned
+        self._change_indices = diff_result.change_indices()
+
+    def _first_line_of(self, *diff_types: DiffType) -> Optional[int]:
+        """Return the first diff line index of any of ``diff_types``."""
+        firsts = [indices[0] for indices in map(self._diff_result.indices_of, diff_types) if indices]
+        return min(firsts) if firsts else None
+
     def align_lines(self):
         """Align lines to improve diff accuracy."""
         if not self._diff_result:
             return
 
-        left_lines = self._left_content.split('\n')
-        right_lines = self._right_content.split('\n')
-
-        aligned_result = LineAligner.align_lines(left_lines, right_lines, self._diff_result)
-        self._diff_result = aligned_result
+        aligned_result = LineAligner.align_lines(
+            self._left_lines, self._right_lines, self._diff_result
+        )
+        self._set_diff_result(aligned_result, aligned=True)
 
-        self.left_highlighter.set_diff_result(self._diff_result)
-        self.right_highlighter.set_diff_result(self._diff_result)
+        self._update_diff_selections()
 
         self.connection_lines.set_diff_result(self._diff_result)
         self._update_connection_lines()
@@ -791,17 +1222,24 @@ class DiffView(QWidget):
     def _on_search(self, search_text: str, case_sensitive: bool, 
                    whole_word: bool, use_regex: bool):
         """Handle search request."""
-        pattern = SearchHelper.build_pattern(search_text, case_sensitive, 
-                                          whole_word, use_regex)
+        if SearchHelper.is_literal_search(case_sensitive, whole_word, use_regex):
+            def find(text, start_pos):
+                return SearchHelper.find_literal(text, search_text, start_pos)
+        else:
+            pattern = SearchHelper.build_pattern(search_text, case_sensitive, 
+                                              whole_word, use_regex)
+
+            def find(text, start_pos):
+                return SearchHelper.find_in_text(text, pattern, start_pos, forward=True)
         
         for editor in [self.left_editor, self.right_editor]:
             cursor = editor.textCursor()
             start_pos = cursor.position()
             text = editor.toPlainText()
             
-            pos = SearchHelper.find_in_text(text, pattern, start_pos, forward=True)
+            pos = find(text, start_pos)
             if pos == -1:
-                pos = SearchHelper.find_in_text(text, pattern, 0, forward=True)
+                pos = find(text, 0)
             
             if pos != -1:
                 new_cursor = QTextCursor(editor.document())
@@ -841,38 +1279,82 @@ class DiffView(QWidget):
         )
         
         for editor in [self.left_editor, self.right_editor]:
-            text = editor.toPlainText()
-            new_text = SearchHelper.replace_in_text(text, pattern, replace_text)
-            editor.setPlainText(new_text)
+            self._replace_all_in_editor(editor, pattern, replace_text)
+
+    @staticmethod
+    def _replace_all_in_editor(editor: QPlainTextEdit, pattern, replace_text: str) -> int:
+        """Replace every match of ``pattern`` in place, as one undoable edit.
+
+        Matches are replaced back to front through a QTextCursor, so earlier
+        positions stay valid and the rest of the document (cursors, undo
+        stack, highlighting of untouched blocks) is left alone.
+        """
+        text = editor.toPlainText()
+        matches = list(pattern.finditer(text))
+        if not matches:
+            return 0
+
+        # QTextCursor positions count UTF-16 code units, which only differ
+        # from str indices when the text contains non-BMP characters.
+        if len(text.encode("utf-16-le")) // 2 == len(text):
+            edits = [(m.start(), m.end(), m.expand(replace_text)) for m in matches]
+        else:
+            edits = []
+            index = offset = 0
+            for m in matches:
+                offset += len(text[index:m.start()].encode("utf-16-le")) // 2
+                start = offset
+                offset += len(m.group().encode("utf-16-le")) // 2
+                index = m.end()
+                edits.append((start, offset, m.expand(replace_text)))
+
+        cursor = QTextCursor(editor.document())
+        cursor.beginEditBlock()
+        for start, end, replacement in reversed(edits):
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.insertText(replacement)
+        cursor.endEditBlock()
+        return len(edits)
 
     def _update_inline_diff(self):
         """Update inline character-level diff highlighting."""
         if not self._left_content or not self._right_content:
             return
 
-        self._inline_diff_result = InlineDiffResult.from_text(
-            self._left_content, self._right_content
+        # The char-level diff runs on the thread pool; bumping the generation
+        # makes any result still in flight for older content get dropped.
+        self._inline_generation += 1
+        worker = InlineDiffWorker(
+            self._inline_generation, self._left_content, self._right_content
         )
+        worker.signals.finished.connect(self._on_inline_diff_finished)
+        self._inline_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_inline_diff_finished(self, generation: int, result: InlineDiffResult):
+        """Apply an inline diff result computed by InlineDiffWorker."""
+        if generation != self._inline_generation:
+            return
+        self._inline_worker = None
+        if not self._inline_mode:
+            return
 
+        self._inline_diff_result = result
         self.left_inline_highlighter.set_inline_diff_result(self._inline_diff_result)
         self.right_inline_highlighter.set_inline_diff_result(self._inline_diff_result)
 
     def set_inline_mode(self, enabled: bool):
         """Enable or disable inline character-level diff mode."""
         self._inline_mode = enabled
+        self._update_diff_selections()
         if enabled:
-            self.left_highlighter.setEnabled(False)
-            self.right_highlighter.setEnabled(False)
             self.left_inline_highlighter.setEnabled(True)
             self.right_inline_highlighter.setEnabled(True)
             self._update_inline_diff()
         else:
-            self.left_highlighter.setEnabled(True)
-            self.right_highlighter.setEnabled(True)
             self.left_inline_highlighter.setEnabled(False)
             self.right_inline_highlighter.setEnabled(False)
-            self.left_highlighter.set_diff_result(self._diff_result)
-            self.right_highlighter.set_diff_result(self._diff_result)
 
     def set_column_mode(self, enabled: bool):
         """Enable or disable column edit mode for both editors."""
@@ -937,24 +1419,22 @@ class DiffView(QWidget):
             selected_text = cursor.selectedText()
             cursor2 = self.left_editor.textCursor()
             cursor2.insertText(selected_text)
-            self._left_content = self.left_editor.toPlainText()
         else:
-            lines = self._right_content.split('\n')
-            diff_lines = self._diff_result.lines
-            for i, diff_line in enumerate(diff_lines):
-                if diff_line.type in (DiffType.INSERT, DiffType.REPLACE):
-                    if i < len(lines):
-                        lines[i] = diff_line.content
-                        self._left_content = '\n'.join(lines)
-                        self.left_editor.setPlainText(self._left_content)
-                        break
+            i = self._first_line_of(DiffType.INSERT, DiffType.REPLACE)
+            if i is not None and i < len(self._right_lines):
+                self._set_editor_text(
+                    "left",
+                    self._right_content_with_line(i, self._diff_result.lines[i].content)
+                )
 
     def copy_all_to_left(self):
         """Copy all changes from right to left."""
         if not self._diff_result:
             return
 
-        from PySide6.QtWidgets import QMessageBox
+        # Nothing to copy (and no diff to recompute) if both sides match.
+        if self._left_content == self._right_content:
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Copy All",
@@ -964,9 +1444,8 @@ class DiffView(QWidget):
 
         if reply == QMessageBox.Yes:
             self._create_snapshot("Copy All to Left")
-            self._left_content = self._right_content
-            self.left_editor.setPlainText(self._left_content)
-            self._update_diff()
+            self._set_editor_text("left", self._right_content)
+            self._schedule_diff_update()
 
     def copy_to_right(self):
         """Copy selected/next change from left to right."""
@@ -980,31 +1459,28 @@ class DiffView(QWidget):
             selected_text = cursor.selectedText()
             cursor2 = self.right_editor.textCursor()
             cursor2.insertText(selected_text)
-            self._right_content = self.right_editor.toPlainText()
         else:
-            lines = self._right_content.split('\n')
-            diff_lines = self._diff_result.lines
-            for i, diff_line in enumerate(diff_lines):
-                if diff_line.type in (DiffType.DELETE, DiffType.REPLACE):
-                    if i < len(lines):
-                        left_line = diff_line.content
-                        for j, dl in enumerate(diff_lines):
-                            if dl.type == DiffType.REPLACE and j > i:
-                                if j < len(lines):
-                                    lines[i] = dl.content
-                                break
-                        else:
-                            pass
-                        self._right_content = '\n'.join(lines)
-                        self.right_editor.setPlainText(self._right_content)
-                        break
+            line_count = len(self._right_lines)
+            i = self._first_line_of(DiffType.DELETE, DiffType.REPLACE)
+            if i is not None and i < line_count:
+                replace_indices = self._diff_result.indices_of(DiffType.REPLACE)
+                k = bisect.bisect_right(replace_indices, i)
+                if k < len(replace_indices) and replace_indices[k] < line_count:
+                    self._set_editor_text(
+                        "right",
+                        self._right_content_with_line(
+                            i, self._diff_result.lines[replace_indices[k]].content
+                        )
+                    )
 
     def copy_all_to_right(self):
         """Copy all changes from left to right."""
         if not self._diff_result:
             return
 
-        from PySide6.QtWidgets import QMessageBox
+        # Nothing to copy (and no diff to recompute) if both sides match.
+        if self._left_content == self._right_content:
+            return
 
         reply = QMessageBox.question(
             self, "Confirm Copy All",
@@ -1014,67 +1490,39 @@ class DiffView(QWidget):
 
         if reply == QMessageBox.Yes:
             self._create_snapshot("Copy All to Right")
-            self._right_content = self._left_content
-            self.right_editor.setPlainText(self._right_content)
-            self._update_diff()
+            self._set_editor_text("right", self._left_content)
+            self._schedule_diff_update()
 
     def next_difference(self):
         """Navigate to the next difference."""
         if not self._diff_result:
             return
 
-        diff_lines = self._diff_result.lines
-        cursor = self.left_editor.textCursor()
-        current_block = cursor.blockNumber()
-
-        for i in range(current_block + 1, len(diff_lines)):
-            if diff_lines[i].is_change:
-                block = self.left_editor.document().firstBlock()
-                for _ in range(i):
-                    block = block.next()
-                new_cursor = QTextCursor(block)
-                self.left_editor.setTextCursor(new_cursor)
-
-                block = self.right_editor.document().firstBlock()
-                for _ in range(i):
-                    block = block.next()
-                new_cursor = QTextCursor(block)
-                self.right_editor.setTextCursor(new_cursor)
-
-                self.left_editor.setFocus()
-                break
+        current_block = self.left_editor.textCursor().blockNumber()
+        index = bisect.bisect_right(self._change_indices, current_block)
+        if index < len(self._change_indices):
+            self._goto_line(self._change_indices[index])
 
     def prev_difference(self):
         """Navigate to the previous difference."""
         if not self._diff_result:
             return
 
-        diff_lines = self._diff_result.lines
-        cursor = self.left_editor.textCursor()
-        current_block = cursor.blockNumber()
-
-        for i in range(current_block - 1, -1, -1):
-            if diff_lines[i].is_change:
-                block = self.left_editor.document().firstBlock()
-                for _ in range(i):
-                    block = block.next()
-                new_cursor = QTextCursor(block)
-                self.left_editor.setTextCursor(new_cursor)
-
-                block = self.right_editor.document().firstBlock()
-                for _ in range(i):
-                    block = block.next()
-                new_cursor = QTextCursor(block)
-                self.right_editor.setTextCursor(new_cursor)
-
-                self.left_editor.setFocus()
-                break
+        current_block = self.left_editor.textCursor().blockNumber()
+        index = bisect.bisect_left(self._change_indices, current_block) - 1
+        if index >= 0:
+            self._goto_line(self._change_indices[index])
+
+    def _goto_line(self, line_number: int):
+        """Move both editors' cursors to the start of ``line_number``."""
+        for editor in (self.left_editor, self.right_editor):
+            block = editor.document().findBlockByNumber(line_number)
+            if block.isValid():
+                editor.setTextCursor(QTextCursor(block))
+        self.left_editor.setFocus()
 
     def save_merged(self):
         """Save the merged result to a file."""
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
-        from PySide6.QtCore import QFileDevice
-
         merged_content = self._right_content
 
         file_path, _ = QFileDialog.getSaveFileName(
@@ -1083,8 +1531,7 @@ class DiffView(QWidget):
 
         if file_path:
             try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(merged_content)
+                write_file_direct(file_path, merged_content)
             except Exception as e:
                 QMessageBox.critical(
                     self, "Error", f"Failed to save file: {e}"
@@ -1092,8 +1539,6 @@ class DiffView(QWidget):
 
     def export_report(self, format: str):
         """Export diff report in specified format."""
-        from PySide6.QtWidgets import QFileDialog, QMessageBox
-
         if not self._diff_result:
             QMessageBox.warning(
                 self, "No Diff", 
@@ -1101,21 +1546,14 @@ class DiffView(QWidget):
             )
             return
 
-        format_map = {
-            "html": ("HTML Report (*.html)", ".html"),
-            "text": ("Text Report (*.txt)", ".txt"),
-            "unified": ("Unified Diff (*.diff)", ".diff"),
-            "json": ("JSON Report (*.json)", ".json")
-        }
-
-        if format not in format_map:
+        if format not in REPORT_FORMATS:
             QMessageBox.warning(
                 self, "Invalid Format",
                 f"Unknown format: {format}"
             )
             return
 
-        filter_text, extension = format_map[format]
+        generator, filter_text, extension, needs_content = REPORT_FORMATS[format]
         default_name = f"diff_report{extension}"
 
         file_path, _ = QFileDialog.getSaveFileName(
@@ -1124,54 +1562,85 @@ class DiffView(QWidget):
             f"{filter_text};;All Files (*)"
         )
 
-        if file_path:
-            try:
-                if format == "html":
-                    report = ReportGenerator.generate_html_report(
-                        self._diff_result,
-                        self._left_file_path or "",
-                        self._right_file_path or "",
-                        self._left_content,
-                        self._right_content
-                    )
-                elif format == "text":
-                    report = ReportGenerator.generate_text_report(
-                        self._diff_result,
-                        self._left_file_path or "",
-                        self._right_file_path or ""
-                    )
-                elif format == "unified":
-                    report = ReportGenerator.generate_unified_diff_report(
-                        self._diff_result,
-                        self._left_file_path or "",
-                        self._right_file_path or "",
-                        self._left_content,
-                        self._right_content
-                    )
-                elif format == "json":
-                    report = ReportGenerator.generate_json_report(
-                        self._diff_result,
-                        self._left_file_path or "",
-                        self._right_file_path or "",
-                        self._left_content,
-                        self._right_content
-                    )
+        if not file_path:
+            return
 
-                if ReportGenerator.save_report(report, file_path):
-                    QMessageBox.information(
-                        self, "Export Successful",
-                        f"Report saved to:\n{file_path}"
-                    )
-                else:
-                    QMessageBox.critical(
-                        self, "Export Failed",
-                        "Failed to save report file."
-                    )
-            except Exception as e:
-                QMessageBox.critical(
-                    self, "Export Error",
-                    f"Error exporting report: {e}"
-                )
+        left_path = self._left_file_path or ""
+        right_path = self._right_file_path or ""
+        report_key = self._content_digests() + (
+            self._ignore_options.as_tuple(), self._diff_aligned,
+            left_path, right_path, format
+        )
+        generated_at = datetime.now()
+        cached = self._report_cache.get(report_key)
+        if cached is not None:
+            self._report_cache.move_to_end(report_key)
+            cached_report, cached_at = cached
+            generate = functools.partial(
+                ReportGenerator.restamp_report, cached_report, cached_at, generated_at
+            )
+        else:
+            args = (self._diff_result, left_path, right_path)
+            if needs_content:
+                args += (self._left_content, self._right_content)
+            generate = functools.partial(generator, *args, generated_at=generated_at)
+
+        worker = ReportWorker(generate, file_path)
+        worker.signals.generated.connect(
+            functools.partial(self._cache_report, report_key, generated_at)
+        )
+        worker.signals.finished.connect(self._on_report_finished)
+        worker.signals.failed.connect(self._on_report_failed)
+        self._report_worker = worker
+
+        self._report_progress = QProgressDialog("Generating report...", None, 0, 0, self)
+        self._report_progress.setWindowTitle("Export Report")
+        self._report_progress.setWindowModality(Qt.WindowModal)
+        self._report_progress.setMinimumDuration(0)
+        self._report_progress.show()
+
+        QThreadPool.globalInstance().start(worker)
+
+    def _cache_report(self, key: tuple, generated_at: datetime, report: str):
+        """Remember a generated report for repeated exports of the same diff.
+
+        The generation time is kept with it, so a later export can restamp
+        the report with its own time.
+        """
+        self._report_cache[key] = (report, generated_at)
+        self._report_cache.move_to_end(key)
+        if len(self._report_cache) > REPORT_CACHE_SIZE:
+            self._report_cache.popitem(last=False)
+
+    def _finish_report_export(self):
+        """Close the progress dialog of a finished report export."""
+        self._report_worker = None
+        if self._report_progress is not None:
+            self._report_progress.close()
+            self._report_progress.deleteLater()
+            self._report_progress = None
+
+    def _on_report_finished(self, file_path: str, saved: bool):
+        """Report the outcome of a ReportWorker."""
+        self._finish_report_export()
+        if saved:
+            QMessageBox.information(
+                self, "Export Successful",
+                f"Report saved to:\n{file_path}"
+            )
+        else:
+            QMessageBox.critical(
+                self, "Export Failed",
+                "Failed to save report file."
+            )
+
+    def _on_report_failed(self, error: str):
+        """Report an exception raised while generating a report."""
+        self._finish_report_export()
+        QMessageBox.critical(
+            self, "Export Error",
+            f"Error exporting report: {error}"
+        )
 
     def can_undo(self) -> bool:
         """Check if undo is available."""
@@ -1186,12 +1655,14 @@ class DiffView(QWidget):
         snapshot = self._undo_manager.undo()
         if snapshot:
             self._is_undo_redo_operation = True
+            left_content = self._left_content
+            right_content = self._right_content
             self._left_content = snapshot["left_content"]
             self._right_content = snapshot["right_content"]
-            self.left_editor.setPlainText(self._left_content)
-            self.right_editor.setPlainText(self._right_content)
+            self._splice_editor_text(self.left_editor, left_content, self._left_content)
+            self._splice_editor_text(self.right_editor, right_content, self._right_content)
             self._is_undo_redo_operation = False
-            self._update_diff()
+            self._schedule_diff_update()
             self.content_changed.emit()
             return True
         return False
@@ -1201,16 +1672,58 @@ class DiffView(QWidget):
         snapshot = self._undo_manager.redo()
         if snapshot:
             self._is_undo_redo_operation = True
+            left_content = self._left_content
+            right_content = self._right_content
             self._left_content = snapshot["left_content"]
             self._right_content = snapshot["right_content"]
-            self.left_editor.setPlainText(self._left_content)
-            self.right_editor.setPlainText(self._right_content)
+            self._splice_editor_text(self.left_editor, left_content, self._left_content)
+            self._splice_editor_text(self.right_editor, right_content, self._right_content)
             self._is_undo_redo_operation = False
-            self._update_diff()
+            self._schedule_diff_update()
             self.content_changed.emit()
             return True
         return False
 
+    @staticmethod
+    def _splice_editor_text(editor: QPlainTextEdit, old_text: str, new_text: str):
+        """Change an editor's text from ``old_text`` to ``new_text``.
+
+        Only the span between the common prefix and suffix is replaced, in
+        one edit block, so Qt re-lays out and re-highlights just the touched
+        blocks. Unlike setPlainText() the document object and the scroll
+        position are kept. The change is not recorded in the document's own
+        undo stack: these writes are tracked by the view's UndoRedoManager,
+        and keeping the replaced text twice would double the memory used.
+        """
+        if old_text == new_text:
+            return
+        prefix = common_prefix_length(old_text, new_text)
+        suffix = common_suffix_length(
+            old_text, new_text, min(len(old_text), len(new_text)) - prefix
+        )
+        replacement = new_text[prefix:len(new_text) - suffix]
+        removed_end = len(old_text) - suffix
+
+        # QTextCursor positions count UTF-16 code units.
+        if old_text.isascii():
+            start, end = prefix, removed_end
+        else:
+            start = len(old_text[:prefix].encode("utf-16-le")) // 2
+            end = start + len(old_text[prefix:removed_end].encode("utf-16-le")) // 2
+
+        document = editor.document()
+        undo_enabled = document.isUndoRedoEnabled()
+        document.setUndoRedoEnabled(False)
+        try:
+            cursor = QTextCursor(document)
+            cursor.beginEditBlock()
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.insertText(replacement)
+            cursor.endEditBlock()
+        finally:
+            document.setUndoRedoEnabled(undo_enabled)
+
     def get_undo_description(self) -> str:
         """Get description of the next action to undo."""
         return self._undo_manager.get_undo_description()
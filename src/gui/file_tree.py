@@ -6,68 +6,346 @@ Supports file filtering similar to WinMerge.
 """
 
 import os
+import stat
 import logging
-import fnmatch
 logger = logging.getLogger("MergeDiffTool.FileTreeView")
 
-from typing import Optional, Tuple, List
+from typing import Callable, Optional, Tuple, List
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QSplitter, QTreeView,
     QFrame, QVBoxLayout, QLabel, QPushButton,
-    QFileDialog, QFileSystemModel, QHeaderView,
+    QFileDialog, QFileIconProvider, QHeaderView,
     QComboBox, QToolBar, QApplication
 )
-from PySide6.QtCore import Qt, Signal, QDir, QEvent, QSortFilterProxyModel
+from PySide6.QtCore import (
+    Qt, Signal, QEvent, QSize, QTimer,
+    QAbstractItemModel, QModelIndex, QObject, QRunnable, QThreadPool
+)
 from PySide6.QtGui import QFont, QIcon
-from src.utils.config import load_filters, FileFilter
+from src.utils.config import load_filters, FileFilter, GlobMatcher
+
+
+class _FileNode:
+    """A file or directory entry in LazyFileSystemModel."""
+
+    __slots__ = ("name", "path", "is_dir", "parent", "row", "children", "loading")
+
+    def __init__(self, name: str, path: str, is_dir: bool,
+                 parent: Optional["_FileNode"] = None, row: int = 0):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = row
+        # None until fetchMore() starts listing the directory.
+        self.children: Optional[List["_FileNode"]] = None
+        self.loading = False
+
+
+# Number of directory entries inserted into the model per batch.
+LIST_BATCH_SIZE = 256
+
+# Quiet period after the last filter combo change before the filter is applied.
+FILTER_APPLY_DELAY_MS = 150
+
+
+class DirectoryListSignals(QObject):
+    """Signals emitted by DirectoryListWorker."""
+
+    batch_ready = Signal(int, object, object)
+    finished = Signal(int, object)
+
+
+class DirectoryListWorker(QRunnable):
+    """List one directory of a LazyFileSystemModel on a thread pool thread.
+
+    The sorted entries are delivered in batches of LIST_BATCH_SIZE, tagged
+    with the model generation and node they were requested for.
+    """
+
+    def __init__(self, list_entries: Callable[[str], List[Tuple[str, str, bool]]],
+                 generation: int, node: _FileNode):
+        super().__init__()
+        self.signals = DirectoryListSignals()
+        self._list_entries = list_entries
+        self._generation = generation
+        self._node = node
+
+    def run(self):
+        entries = self._list_entries(self._node.path)
+        for start in range(0, len(entries), LIST_BATCH_SIZE):
+            self.signals.batch_ready.emit(
+                self._generation, self._node, entries[start:start + LIST_BATCH_SIZE]
+            )
+        self.signals.finished.emit(self._generation, self._node)
 
 
-class FilteredFileSystemModel(QFileSystemModel):
+class LazyFileSystemModel(QAbstractItemModel):
+    """Read-only, single-column file system model backed by os.scandir.
+
+    Unlike QFileSystemModel it does not watch the file system or gather
+    size/type/date metadata; a directory is listed only when the view
+    first asks for its children (fetchMore), using the file type that
+    os.scandir already reports. Listing runs on the global thread pool and
+    rows are inserted in batches, so slow (e.g. network) drives do not
+    block the UI.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _FileNode("", "", False)
+        self._generation = 0
+        self._list_workers = set()
+        self._icons: Optional[Tuple[QIcon, QIcon]] = None
+        self._descending = False
+
+    def setRootPath(self, path: str) -> QModelIndex:
+        """Show the contents of ``path``; returns the root (invalid) index."""
+        self.beginResetModel()
+        # Listings still in flight belong to the old tree and are dropped.
+        self._generation += 1
+        self._root = _FileNode(
+            os.path.basename(path) or path, path, bool(path) and os.path.isdir(path)
+        )
+        self.endResetModel()
+        return QModelIndex()
+
+    def rootPath(self) -> str:
+        """Get the directory shown at the top level."""
+        return self._root.path
+
+    def refresh(self):
+        """Forget all listed directories so they are scanned again."""
+        if not self._root.is_dir:
+            # Nothing has been listed yet, e.g. before a folder is chosen.
+            return
+        self.setRootPath(self._root.path)
+
+    def _node(self, index: QModelIndex) -> _FileNode:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def filePath(self, index: QModelIndex) -> str:
+        """Get the absolute path for an index."""
+        return self._node(index).path
+
+    def fileName(self, index: QModelIndex) -> str:
+        """Get the file name for an index."""
+        return self._node(index).name
+
+    def isDir(self, index: QModelIndex) -> bool:
+        """Check if an index refers to a directory."""
+        return self._node(index).is_dir
+
+    def _accepts_entry(self, name_lower: str, is_dir: bool) -> bool:
+        """Check if a directory entry, given its lowercased name, should be listed."""
+        return True
+
+    @staticmethod
+    def _is_hidden(entry: os.DirEntry) -> bool:
+        """Check if an entry is hidden, matching QDir's default filter."""
+        if os.name == "nt":
+            # On Windows DirEntry.stat() is answered from the directory listing.
+            attributes = entry.stat(follow_symlinks=False).st_file_attributes
+            return bool(attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+        return entry.name.startswith(".")
+
+    def _list_entries(self, path: str) -> List[Tuple[str, str, bool]]:
+        """Scan a directory for (name, path, is_dir) entries, directories first.
+
+        Names are ordered case-insensitively in the model's current sort order.
+        Runs on a worker thread; it must not touch the model's nodes.
+        """
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                        hidden = self._is_hidden(entry)
+                    except OSError:
+                        continue
+                    name_lower = entry.name.lower()
+                    if hidden or not self._accepts_entry(name_lower, is_dir):
+                        continue
+                    entries.append((not is_dir, name_lower, entry.name, entry.path, is_dir))
+        except OSError as e:
+            logger.debug(f"Cannot list {path}: {e}")
+
+        entries.sort(key=lambda entry: entry[1], reverse=self._descending)
+        entries.sort(key=lambda entry: entry[0])
+        return [(name, entry_path, is_dir) for _, _, name, entry_path, is_dir in entries]
+
+    def _index_of(self, node: _FileNode) -> QModelIndex:
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _on_entries_listed(self, generation: int, node: _FileNode,
+                           entries: List[Tuple[str, str, bool]]):
+        """Append a batch of listed entries to a directory node."""
+        if generation != self._generation:
+            return
+        first = len(node.children)
+        self.beginInsertRows(self._index_of(node), first, first + len(entries) - 1)
+        node.children.extend(
+            _FileNode(name, path, is_dir, node, first + offset)
+            for offset, (name, path, is_dir) in enumerate(entries)
+        )
+        self.endInsertRows()
+
+    def _on_listing_finished(self, generation: int, node: _FileNode):
+        """Mark a directory as fully listed."""
+        self._list_workers.discard(self.sender())
+        if generation != self._generation:
+            return
+        node.loading = False
+        if not node.children:
+            # Drop the expand indicator of directories that turned out empty.
+            index = self._index_of(node)
+            if index.isValid():
+                self.dataChanged.emit(index, index)
+
+    def is_loading(self) -> bool:
+        """Check if any directory listing is still in progress."""
+        return bool(self._list_workers)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        children = self._node(parent).children
+        if children is None or not (0 <= row < len(children)) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        children = self._node(parent).children
+        return len(children) if children is not None else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node.children is not None and not node.loading:
+            return bool(node.children)
+        return node.is_dir
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        node = self._node(parent)
+        return node.is_dir and node.children is None
+
+    def fetchMore(self, parent: QModelIndex):
+        node = self._node(parent)
+        if not node.is_dir or node.children is not None:
+            return
+        node.children = []
+        node.loading = True
+        worker = DirectoryListWorker(self._list_entries, self._generation, node)
+        worker.signals.batch_ready.connect(self._on_entries_listed)
+        worker.signals.finished.connect(self._on_listing_finished)
+        self._list_workers.add(worker.signals)
+        QThreadPool.globalInstance().start(worker)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Reorder listed directories by name, keeping directories first."""
+        descending = order == Qt.SortOrder.DescendingOrder
+        if column != 0 or descending == self._descending:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._descending = descending
+        persistent = self.persistentIndexList()
+        nodes = [index.internalPointer() for index in persistent]
+
+        pending = [self._root]
+        while pending:
+            node = pending.pop()
+            if not node.children:
+                continue
+            node.children.sort(key=lambda child: child.name.lower(), reverse=descending)
+            node.children.sort(key=lambda child: not child.is_dir)
+            for row, child in enumerate(node.children):
+                child.row = row
+            pending.extend(node.children)
+
+        self.changePersistentIndexList(persistent, [self._index_of(node) for node in nodes])
+        self.layoutChanged.emit()
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name
+        if role == Qt.ItemDataRole.DecorationRole:
+            if self._icons is None:
+                # Created on first paint, not when the (possibly still empty)
+                # tree is constructed.
+                icon_provider = QFileIconProvider()
+                self._icons = (
+                    icon_provider.icon(QFileIconProvider.IconType.Folder),
+                    icon_provider.icon(QFileIconProvider.IconType.File),
+                )
+            return self._icons[0] if node.is_dir else self._icons[1]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return node.path
+        return None
+
+    def headerData(self, section: int, orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal and section == 0
+                and role == Qt.ItemDataRole.DisplayRole):
+            return "Name"
+        return None
+
+
+class FilteredFileSystemModel(LazyFileSystemModel):
     """File system model with filtering support."""
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._include_patterns: List[str] = []
-        self._exclude_patterns: List[str] = []
+        self._include_matcher = GlobMatcher.for_patterns(())
+        self._exclude_matcher = GlobMatcher.for_patterns(())
+
+    def set_filter(self, file_filter: Optional[FileFilter]):
+        """Filter by a FileFilter's compiled patterns, or show everything for None."""
+        if file_filter is None:
+            self._set_matchers(GlobMatcher.for_patterns(()), GlobMatcher.for_patterns(()))
+        else:
+            self._set_matchers(file_filter.include_matcher, file_filter.exclude_matcher)
 
     def set_include_patterns(self, patterns: List[str]):
         """Set include patterns for filtering."""
-        self._include_patterns = patterns
+        self._set_matchers(GlobMatcher.for_patterns(tuple(patterns)), self._exclude_matcher)
 
     def set_exclude_patterns(self, patterns: List[str]):
         """Set exclude patterns for filtering."""
-        self._exclude_patterns = patterns
-
-    def _matches_pattern(self, filename: str, patterns: List[str]) -> bool:
-        """Check if filename matches any of the patterns."""
-        filename_lower = filename.lower()
-        for pattern in patterns:
-            pattern_lower = pattern.lower()
-            if pattern_lower.endswith("*"):
-                prefix = pattern_lower[:-1]
-                if filename_lower.startswith(prefix):
-                    return True
-            elif pattern_lower.startswith("*"):
-                suffix = pattern_lower[1:]
-                if filename_lower.endswith(suffix):
-                    return True
-            elif fnmatch.fnmatch(filename_lower, pattern_lower):
-                return True
-        return False
+        self._set_matchers(self._include_matcher, GlobMatcher.for_patterns(tuple(patterns)))
 
-    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
-        """Filter rows based on include/exclude patterns."""
-        index = self.index(source_row, 0, source_parent)
-        filename = self.fileName(index)
-        filepath = self.filePath(index)
+    def _set_matchers(self, include_matcher: GlobMatcher, exclude_matcher: GlobMatcher):
+        """Switch to new matchers and relist the tree if they changed."""
+        if (include_matcher is self._include_matcher
+                and exclude_matcher is self._exclude_matcher):
+            return
+        self._include_matcher = include_matcher
+        self._exclude_matcher = exclude_matcher
+        self.refresh()
 
-        if os.path.isdir(filepath):
+    def _accepts_entry(self, name_lower: str, is_dir: bool) -> bool:
+        """Filter entries based on include/exclude patterns."""
+        if is_dir:
             return True
 
-        if self._exclude_patterns and self._matches_pattern(filename, self._exclude_patterns):
+        if self._exclude_matcher and self._exclude_matcher.matches(name_lower):
             return False
 
-        if self._include_patterns and not self._matches_pattern(filename, self._include_patterns):
+        if self._include_matcher and not self._include_matcher.matches(name_lower):
             return False
 
         return True
@@ -113,6 +391,11 @@ class DirectoryTree(QWidget):
         self.filter_combo.currentIndexChanged.connect(self._on_filter_changed)
         toolbar.addWidget(self.filter_combo)
 
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_APPLY_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
         layout.addWidget(toolbar)
 
         self.tree_view = QTreeView()
@@ -122,22 +405,17 @@ class DirectoryTree(QWidget):
         self.tree_view.setHeaderHidden(False)
 
         self.model = FilteredFileSystemModel()
-        self.model.setRootPath("")
-        self.model.setFilter(QDir.AllDirs | QDir.Files | QDir.NoDotAndDotDot)
-
-        self.proxy_model = QSortFilterProxyModel()
-        self.proxy_model.setSourceModel(self.model)
-        self.proxy_model.setFilterRole(Qt.ItemDataRole.FilePathRole)
-
-        self.tree_view.setModel(self.proxy_model)
+        # The model filters and sorts itself, so the view uses it directly.
+        self.tree_view.setModel(self.model)
+        self.tree_view.sortByColumn(0, Qt.SortOrder.AscendingOrder)
         self.tree_view.setColumnWidth(0, 200)
-        self.tree_view.setColumnWidth(1, 80)
-        self.tree_view.setColumnWidth(2, 150)
-        self.tree_view.setColumnWidth(3, 150)
 
-        self.tree_view.hideColumn(1)
-        self.tree_view.hideColumn(2)
-        self.tree_view.hideColumn(3)
+        # A refresh (e.g. a filter change) relists the tree; re-expand the
+        # folders that were open as they are listed again instead of
+        # expanding, and so listing, the whole tree.
+        self._expand_paths = set()
+        self.model.modelAboutToBeReset.connect(self._remember_expanded)
+        self.model.rowsInserted.connect(self._restore_expanded)
 
         layout.addWidget(self.tree_view)
 
@@ -156,7 +434,16 @@ class DirectoryTree(QWidget):
         self.filter_combo.setCurrentIndex(0)
 
     def _on_filter_changed(self, index):
-        """Handle filter selection change."""
+        """Handle filter selection change.
+
+        The filter is applied once the selection has been stable for
+        FILTER_APPLY_DELAY_MS, so stepping through the combo with the
+        arrow keys does not relist the tree for every entry passed.
+        """
+        self._filter_timer.start()
+
+    def _apply_filter(self):
+        """Apply the filter currently selected in the combo box."""
         filter_name = self.filter_combo.currentData()
 
         if filter_name == "custom":
@@ -164,17 +451,13 @@ class DirectoryTree(QWidget):
             return
 
         if not filter_name:
-            self.model.set_include_patterns([])
-            self.model.set_exclude_patterns([])
+            self.model.set_filter(None)
         else:
             for f in self._filters:
                 if f.name == filter_name:
-                    self.model.set_include_patterns(f.include_patterns)
-                    self.model.set_exclude_patterns(f.exclude_patterns)
+                    self.model.set_filter(f)
                     break
 
-        self.tree_view.expandAll()
-
     def _show_custom_filter_dialog(self):
         """Show dialog for custom filter patterns."""
         from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QLabel, QDialogButtonBox
@@ -207,14 +490,41 @@ class DirectoryTree(QWidget):
             include_patterns = [p.strip() for p in include_text.split(",") if p.strip()]
             exclude_patterns = [p.strip() for p in exclude_text.split(",") if p.strip()]
 
-            self.model.set_include_patterns(include_patterns)
-            self.model.set_exclude_patterns(exclude_patterns)
+            self.model.set_filter(FileFilter(
+                name="Custom", description="",
+                include_patterns=include_patterns,
+                exclude_patterns=exclude_patterns,
+            ))
 
             current_text = self.filter_combo.currentText()
             self.filter_combo.setItemText(self.filter_combo.currentIndex(), f"Custom: {current_text}")
         else:
             self.filter_combo.setCurrentIndex(0)
 
+    def _remember_expanded(self):
+        """Record the paths of the expanded folders before the model resets."""
+        paths = set()
+        pending = [QModelIndex()]
+        while pending:
+            parent = pending.pop()
+            for row in range(self.model.rowCount(parent)):
+                index = self.model.index(row, 0, parent)
+                if self.tree_view.isExpanded(index):
+                    paths.add(self.model.filePath(index))
+                    pending.append(index)
+        self._expand_paths = paths
+
+    def _restore_expanded(self, parent: QModelIndex, first: int, last: int):
+        """Expand newly listed folders that were expanded before a reset."""
+        if not self._expand_paths:
+            return
+        for row in range(first, last + 1):
+            index = self.model.index(row, 0, parent)
+            path = self.model.filePath(index)
+            if path in self._expand_paths:
+                self._expand_paths.discard(path)
+                self.tree_view.expand(index)
+
     def _browse_folder(self):
         """Open a folder browser dialog."""
         folder = self.model.filePath(self.tree_view.rootIndex())
@@ -234,18 +544,30 @@ class DirectoryTree(QWidget):
         self.path_label.setText(path if path else "No folder selected")
 
         if path and os.path.exists(path):
-            source_index = self.model.setRootPath(path)
-            proxy_index = self.proxy_model.mapFromSource(source_index)
-            self.tree_view.setRootIndex(proxy_index)
+            root_index = self.model.setRootPath(path)
+        elif self.model.rootPath():
+            root_index = self.model.setRootPath("")
         else:
-            self.tree_view.setRootIndex(self.proxy_model.index(""))
+            # No folder has been shown yet; leave the empty model alone.
+            return
+        self.tree_view.setRootIndex(root_index)
 
     def get_selected_path(self) -> Optional[str]:
         """Get the currently selected file/folder path."""
         index = self.tree_view.currentIndex()
         if index.isValid():
-            source_index = self.proxy_model.mapToSource(index)
-            return self.model.filePath(source_index)
+            return self.model.filePath(index)
+        return None
+
+    def get_selected_file(self) -> Optional[str]:
+        """Get the currently selected file path, or None for a folder.
+
+        Uses the directory flag the model recorded while listing instead
+        of asking the file system again.
+        """
+        index = self.tree_view.currentIndex()
+        if index.isValid() and not self.model.isDir(index):
+            return self.model.filePath(index)
         return None
 
     def _setup_drag_drop(self):
@@ -361,14 +683,14 @@ class FileTreeView(QWidget):
 
     def _on_left_double_click(self, index):
         """Handle double-click on left tree."""
-        path = self.left_tree.get_selected_path()
-        if path and os.path.isfile(path):
+        path = self.left_tree.get_selected_file()
+        if path:
             self._emit_file_pair(path)
 
     def _on_right_double_click(self, index):
         """Handle double-click on right tree."""
-        path = self.right_tree.get_selected_path()
-        if path and os.path.isfile(path):
+        path = self.right_tree.get_selected_file()
+        if path:
             self._emit_file_pair(path)
 
     def _emit_file_pair(self, right_path: str):
@@ -381,13 +703,17 @@ class FileTreeView(QWidget):
         if not self._left_path:
             return right_path
 
-        if self._right_path and right_path.startswith(self._right_path):
-            rel_path = right_path[len(self._right_path):].lstrip(os.sep)
-            left_path = os.path.join(self._left_path, rel_path)
-            if os.path.exists(left_path):
-                return left_path
+        if not self._right_path:
+            return right_path
+        try:
+            if os.path.commonpath([self._right_path, right_path]) != os.path.normpath(self._right_path):
+                return right_path
+        except ValueError:  # Different drives, or mixed absolute/relative paths
+            return right_path
 
-        return right_path
+        rel_path = os.path.relpath(right_path, self._right_path)
+        left_path = os.path.join(self._left_path, rel_path)
+        return left_path if os.path.exists(left_path) else right_path
 
     def set_left_path(self, path: str):
         """Set the left directory path."""
@@ -8,62 +8,274 @@ import logging
 logger = logging.getLogger("MergeDiffTool.HexView")
 
 from PySide6.QtWidgets import (
-    QWidget, QHBoxLayout, QVBoxLayout, QPlainTextEdit,
+    QWidget, QHBoxLayout, QVBoxLayout, QAbstractScrollArea,
     QScrollBar, QLabel, QFrame, QPushButton, QFileDialog,
     QMessageBox, QSplitter
 )
-from PySide6.QtCore import Qt, Signal, QPoint
-from PySide6.QtGui import QTextCursor, QFont, QColor, QPainter, QKeyEvent
-from typing import Optional, List, Tuple
+from PySide6.QtCore import Qt, Signal, QEvent, QPoint, QObject, QRunnable, QThreadPool
+from PySide6.QtGui import QBrush, QFont, QColor, QPainter, QKeyEvent
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, List, Tuple
+import mmap
 import os
 
+from src.utils.fastdiff import scan_byte_diffs
+from src.utils.file_ops import write_bytes_replace
 
-class HexEditor(QPlainTextEdit):
-    """Custom text editor for hex editing."""
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1 << 24
+
+# Upper bound on the number of differing bytes highlighted at once.
+MAX_DIFF_HIGHLIGHTS = 100_000
+
+# Maps every byte to itself when printable ASCII and to "." otherwise.
+_ASCII_TABLE = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+
+
+def read_binary_file(file_path: str):
+    """Open a binary file for display.
+
+    Small files are read into ``bytes``; larger ones are memory-mapped
+    read-only so that opening them does not copy the whole file. Both
+    support ``len``, slicing to ``bytes`` and indexing.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return f.read()
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def release_binary_data(data):
+    """Unmap data returned by read_binary_file once nothing displays it."""
+    if isinstance(data, mmap.mmap):
+        data.close()
+
+
+@dataclass
+class HexLoadResult:
+    """Data and differences produced by HexLoadWorker."""
+    left_data: Any
+    right_data: Any
+    left_loaded: bool
+    right_loaded: bool
+    positions: List[int]
+    total: int
+
+
+class HexLoadSignals(QObject):
+    """Signals emitted by HexLoadWorker."""
+
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class HexLoadWorker(QRunnable):
+    """Read binary files and scan them for differences on a thread pool thread.
+
+    A side with a path is read from disk; a side without one keeps the data
+    passed in for it. Results are delivered together with the generation
+    they were requested for, so the receiver can drop stale ones.
+    """
+
+    def __init__(self, generation: int,
+                 left_path: Optional[str], right_path: Optional[str],
+                 left_data, right_data):
+        super().__init__()
+        self.signals = HexLoadSignals()
+        self._generation = generation
+        self._left_path = left_path
+        self._right_path = right_path
+        self._left_data = left_data
+        self._right_data = right_data
+
+    def run(self):
+        both = self._left_path is not None and self._right_path is not None
+        left_data = self._left_data
+        right_data = self._right_data
+        try:
+            if self._left_path is not None:
+                label = "left file" if both else "file"
+                try:
+                    left_data = read_binary_file(self._left_path)
+                except Exception as e:
+                    self.signals.failed.emit(self._generation, f"Failed to read {label}:\n{e}")
+                    return
+            if self._right_path is not None:
+                label = "right file" if both else "file"
+                try:
+                    right_data = read_binary_file(self._right_path)
+                except Exception as e:
+                    if left_data is not self._left_data:
+                        release_binary_data(left_data)
+                    self.signals.failed.emit(self._generation, f"Failed to read {label}:\n{e}")
+                    return
+            positions, total = scan_byte_diffs(left_data, right_data, MAX_DIFF_HIGHLIGHTS)
+        except ValueError as e:
+            # The data passed in was unmapped by a newer load.
+            self.signals.failed.emit(self._generation, str(e))
+            return
+        self.signals.finished.emit(self._generation, HexLoadResult(
+            left_data, right_data,
+            self._left_path is not None, self._right_path is not None,
+            positions, total,
+        ))
+
+
+class HexEditor(QAbstractScrollArea):
+    """Read-only hex editor that paints only the lines in the viewport.
+
+    Lines are formatted on demand from the raw data in ``paintEvent``, so
+    the cost of showing a file no longer grows with its size.
+    """
+
+    BACKGROUND_COLOR = QColor("#1e1e1e")
+    TEXT_COLOR = QColor("#d4d4d4")
+    DIFF_COLOR = QColor("#ff6b6b")
+    BACKGROUND_BRUSH = QBrush(BACKGROUND_COLOR)
+    DIFF_BRUSH = QBrush(DIFF_COLOR)
+    MARGIN = 4
+    OFFSET_WIDTH = 10
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Courier New", 10))
-        self.setLineWrapMode(QPlainTextEdit.NoWrap)
-        self.setStyleSheet("background-color: #1e1e1e; color: #d4d4d4;")
-        self._data = bytearray()
+        self._data = b""
         self._bytes_per_line = 16
+        self._diff_positions: List[int] = []
+        self._diff_by_line: Dict[int, List[List[int]]] = {}
+        self._update_metrics()
+        font = QFont("Courier New", 10)
+        font.setStyleHint(QFont.Monospace)
+        font.setFixedPitch(True)
+        self.setFont(font)
+        self.setFocusPolicy(Qt.StrongFocus)
 
     def set_data(self, data: bytes):
-        """Set the binary data to display."""
-        self._data = bytearray(data)
+        """Set the binary data to display.
+
+        The data is kept by reference, so it may be a memory map.
+        """
+        self._data = data
+        self._diff_positions = []
+        self._diff_by_line = {}
         self._update_display()
 
     def get_data(self) -> bytes:
         """Get the current binary data."""
         return bytes(self._data)
 
+    def set_diff_positions(self, positions: List[int]):
+        """Set the sorted byte offsets to highlight as differences."""
+        self._diff_positions = positions
+        self._bucket_diff_positions()
+        self.viewport().update()
+
+    def _bucket_diff_positions(self):
+        """Group the diff offsets into (first byte, length) runs per line.
+
+        Consecutive offsets are merged so each run is painted as a single
+        rectangle; runs are split where they wrap onto the next line.
+        """
+        diff_by_line: Dict[int, List[List[int]]] = {}
+        data_len = len(self._data)
+        bytes_per_line = self._bytes_per_line
+        run = None
+        previous = -2
+        for pos in self._diff_positions:
+            if pos >= data_len:
+                break
+            line, col = divmod(pos, bytes_per_line)
+            if pos == previous + 1 and col:
+                run[1] += 1
+            else:
+                run = [col, 1]
+                diff_by_line.setdefault(line, []).append(run)
+            previous = pos
+        self._diff_by_line = diff_by_line
+
+    def line_count(self) -> int:
+        """Get the number of lines needed to show the data."""
+        return -(-len(self._data) // self._bytes_per_line)
+
+    def line_text(self, line: int) -> str:
+        """Format a single line of the hex display."""
+        bytes_per_line = self._bytes_per_line
+        i = line * bytes_per_line
+        chunk = self._data[i:i + bytes_per_line]
+
+        offset = f"{i:08x}"
+        hex_part = chunk.hex(" ").ljust(bytes_per_line * 3 - 1)
+        ascii_part = chunk.translate(_ASCII_TABLE).decode("ascii")
+
+        return f"{offset}  {hex_part}  |{ascii_part}|"
+
+    def _update_metrics(self):
+        """Cache the font measurements used for layout and painting."""
+        metrics = self.fontMetrics()
+        self._line_height = metrics.lineSpacing()
+        self._char_width = metrics.horizontalAdvance("0")
+        self._ascent = metrics.ascent()
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.FontChange:
+            self._update_metrics()
+            self._update_display()
+        super().changeEvent(event)
+
     def _update_display(self):
-        """Update the hex display."""
-        lines = []
-        for i in range(0, len(self._data), self._bytes_per_line):
-            chunk = self._data[i:i + self._bytes_per_line]
-            
-            offset = f"{i:08x}"
-            hex_part = " ".join(f"{b:02x}" for b in chunk)
-            hex_part = hex_part.ljust(self._bytes_per_line * 3 - 1)
-            
-            ascii_part = ""
-            for b in chunk:
-                if 32 <= b <= 126:
-                    ascii_part += chr(b)
-                else:
-                    ascii_part += "."
-            
-            line = f"{offset}  {hex_part}  |{ascii_part}|"
-            lines.append(line)
-        
-        self.setPlainText("\n".join(lines))
+        """Update the scroll ranges and repaint the visible lines."""
+        line_height = self._line_height
+        char_width = self._char_width
+        viewport = self.viewport()
+        visible_lines = max(1, (viewport.height() - self.MARGIN) // line_height)
+        v_bar = self.verticalScrollBar()
+        v_bar.setRange(0, max(0, self.line_count() - visible_lines))
+        v_bar.setPageStep(visible_lines)
+        v_bar.setSingleStep(1)
+
+        line_chars = self._bytes_per_line * 4 + 13
+        line_width = char_width * line_chars + 2 * self.MARGIN
+        h_bar = self.horizontalScrollBar()
+        h_bar.setRange(0, max(0, line_width - viewport.width()))
+        h_bar.setPageStep(viewport.width())
+        h_bar.setSingleStep(char_width)
+        viewport.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_display()
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.BACKGROUND_BRUSH)
+        painter.setPen(self.TEXT_COLOR)
+
+        line_height = self._line_height
+        char_width = self._char_width
+        ascent = self._ascent
+        x = self.MARGIN - self.horizontalScrollBar().value()
+        diff_by_line = self._diff_by_line
+
+        first_line = self.verticalScrollBar().value()
+        visible_lines = self.viewport().height() // line_height + 1
+        last_line = min(self.line_count(), first_line + visible_lines)
+
+        for line in range(first_line, last_line):
+            top = self.MARGIN + (line - first_line) * line_height
+            for first_byte, length in diff_by_line.get(line, ()):
+                col = self.OFFSET_WIDTH + first_byte * 3
+                painter.fillRect(x + col * char_width, top,
+                                 (3 * length - 1) * char_width, line_height,
+                                 self.DIFF_BRUSH)
+            painter.drawText(x, top + ascent, self.line_text(line))
 
     def set_bytes_per_line(self, count: int):
         """Set the number of bytes to display per line."""
         self._bytes_per_line = max(8, min(32, count))
+        self._bucket_diff_positions()
         self._update_display()
 
     def get_bytes_per_line(self) -> int:
@@ -81,9 +293,13 @@ class HexView(QWidget):
         logger.debug("HexView.__init__ called")
         self._left_file_path = None
         self._right_file_path = None
-        self._left_data = bytearray()
-        self._right_data = bytearray()
+        self._left_data = b""
+        self._right_data = b""
         self._diff_enabled = True
+        self._load_generation = 0
+        self._load_worker = None
+        self._pending_left_path = None
+        self._pending_right_path = None
 
         logger.debug("Calling _setup_ui...")
         self._setup_ui()
@@ -103,12 +319,14 @@ class HexView(QWidget):
         self.btn_diff = QPushButton("Compare")
         self.btn_diff.setCheckable(True)
         self.btn_diff.setChecked(True)
+        self.diff_label = QLabel()
         self.btn_save_left = QPushButton("Save Left...")
         self.btn_save_right = QPushButton("Save Right...")
 
         toolbar_layout.addWidget(self.btn_open_left)
         toolbar_layout.addWidget(self.btn_open_right)
         toolbar_layout.addWidget(self.btn_diff)
+        toolbar_layout.addWidget(self.diff_label)
         toolbar_layout.addStretch()
         toolbar_layout.addWidget(self.btn_save_left)
         toolbar_layout.addWidget(self.btn_save_right)
@@ -180,12 +398,7 @@ class HexView(QWidget):
         else:
             file_path = self._left_file_path
 
-        try:
-            with open(file_path, "wb") as f:
-                f.write(self.left_hex.get_data())
-            QMessageBox.information(self, "Success", f"File saved to:\n{file_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save file:\n{e}")
+        self._save_data(file_path, is_left=True)
 
     def _save_right_file(self):
         """Save the right binary data to a file."""
@@ -199,13 +412,53 @@ class HexView(QWidget):
         else:
             file_path = self._right_file_path
 
+        self._save_data(file_path, is_left=False)
+
+    def _save_data(self, file_path: str, is_left: bool):
+        """Write one pane's data to a file.
+
+        The file is replaced rather than truncated in place: another view
+        may have it memory-mapped, and truncating a mapped file would fault
+        the next read of the map. Panes of this view that map the target
+        are switched to in-memory copies first, since Windows refuses to
+        replace a mapped file.
+        """
+        if self.is_loading():
+            QMessageBox.information(self, "Busy", "Files are still being loaded.")
+            return
+
+        target = os.path.normcase(os.path.realpath(file_path))
+        for path, data, set_data in (
+            (self._left_file_path, self._left_data, self._set_left_data),
+            (self._right_file_path, self._right_data, self._set_right_data),
+        ):
+            if (isinstance(data, mmap.mmap) and path
+                    and os.path.normcase(os.path.realpath(path)) == target):
+                set_data(bytes(data))
+
+        data = self._left_data if is_left else self._right_data
         try:
-            with open(file_path, "wb") as f:
-                f.write(self.right_hex.get_data())
+            write_bytes_replace(file_path, data)
             QMessageBox.information(self, "Success", f"File saved to:\n{file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save file:\n{e}")
 
+    def _set_left_data(self, data):
+        """Show new left data and release the data it replaces."""
+        old_data = self._left_data
+        self._left_data = data
+        self.left_hex.set_data(data)
+        if old_data is not data:
+            release_binary_data(old_data)
+
+    def _set_right_data(self, data):
+        """Show new right data and release the data it replaces."""
+        old_data = self._right_data
+        self._right_data = data
+        self.right_hex.set_data(data)
+        if old_data is not data:
+            release_binary_data(old_data)
+
     def _toggle_diff(self, checked: bool):
         """Toggle diff highlighting."""
         self._diff_enabled = checked
@@ -214,116 +467,113 @@ class HexView(QWidget):
     def set_left_file(self, file_path: str):
         """Set the left binary file to display."""
         self._left_file_path = file_path
-        try:
-            with open(file_path, "rb") as f:
-                self._left_data = bytearray(f.read())
-            self.left_hex.set_data(self._left_data)
-            self._update_diff()
-            self.file_loaded.emit(file_path, self._right_file_path or "")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to read file:\n{e}")
+        self._start_load(left_path=file_path)
 
     def set_right_file(self, file_path: str):
         """Set the right binary file to display."""
         self._right_file_path = file_path
-        try:
-            with open(file_path, "rb") as f:
-                self._right_data = bytearray(f.read())
-            self.right_hex.set_data(self._right_data)
-            self._update_diff()
-            self.file_loaded.emit(self._left_file_path or "", file_path)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to read file:\n{e}")
+        self._start_load(right_path=file_path)
 
     def compare_files(self, left_path: str, right_path: str):
         """Compare two binary files."""
         self._left_file_path = left_path
         self._right_file_path = right_path
-
-        try:
-            with open(left_path, "rb") as f:
-                self._left_data = bytearray(f.read())
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to read left file:\n{e}")
+        self._start_load(left_path=left_path, right_path=right_path)
+
+    def _start_load(self, left_path: Optional[str] = None,
+                    right_path: Optional[str] = None):
+        """Read files and rescan differences on the thread pool.
+
+        Paths still being read by an earlier load are read again by the new
+        one, since starting it makes the earlier result stale.
+        """
+        if left_path is None:
+            left_path = self._pending_left_path
+        if right_path is None:
+            right_path = self._pending_right_path
+        self._pending_left_path = left_path
+        self._pending_right_path = right_path
+
+        self._load_generation += 1
+        worker = HexLoadWorker(
+            self._load_generation, left_path, right_path,
+            self._left_data, self._right_data,
+        )
+        worker.signals.finished.connect(self._on_load_finished)
+        worker.signals.failed.connect(self._on_load_failed)
+        self._load_worker = worker
+        if left_path is not None or right_path is not None:
+            self.diff_label.setText("Loading…")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_load_finished(self, generation: int, result: HexLoadResult):
+        """Show the data and differences of the latest load."""
+        if generation != self._load_generation:
+            if result.left_loaded:
+                release_binary_data(result.left_data)
+            if result.right_loaded:
+                release_binary_data(result.right_data)
             return
+        self._load_worker = None
+        self._pending_left_path = None
+        self._pending_right_path = None
+
+        if result.left_loaded:
+            self._set_left_data(result.left_data)
+        if result.right_loaded:
+            self._set_right_data(result.right_data)
+        if self._diff_enabled:
+            self._highlight_diffs(result.positions, result.total)
+        else:
+            self._highlight_diffs([], 0)
+        if result.left_loaded or result.right_loaded:
+            self.file_loaded.emit(self._left_file_path or "", self._right_file_path or "")
 
-        try:
-            with open(right_path, "rb") as f:
-                self._right_data = bytearray(f.read())
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to read right file:\n{e}")
+    def _on_load_failed(self, generation: int, message: str):
+        """Report a failed read of the latest load."""
+        if generation != self._load_generation:
             return
-
-        self.left_hex.set_data(self._left_data)
-        self.right_hex.set_data(self._right_data)
+        self._load_worker = None
+        self._pending_left_path = None
+        self._pending_right_path = None
+        QMessageBox.critical(self, "Error", message)
         self._update_diff()
-        self.file_loaded.emit(left_path, right_path)
+
+    def is_loading(self) -> bool:
+        """Check if files are being read or compared in the background."""
+        return self._load_worker is not None
 
     def _update_diff(self):
         """Update the diff highlighting between left and right panes."""
-        if not self._diff_enabled:
-            return
+        if not self._diff_enabled or not self._left_data or not self._right_data:
+            self._highlight_diffs([], 0)
+        elif self._load_worker is None:
+            self._start_load()
 
-        if not self._left_data or not self._right_data:
-            return
-
-        max_len = max(len(self._left_data), len(self._right_data))
-        diff_positions = []
-
-        for i in range(max_len):
-            left_byte = self._left_data[i] if i < len(self._left_data) else None
-            right_byte = self._right_data[i] if i < len(self._right_data) else None
-
-            if left_byte != right_byte:
-                diff_positions.append(i)
-
-        if diff_positions:
-            self._highlight_diffs(diff_positions)
-
-    def _highlight_diffs(self, positions: List[int]):
+    def _highlight_diffs(self, positions: List[int], total: int):
         """Highlight differing bytes in both hex editors."""
-        bytes_per_line = self.left_hex.get_bytes_per_line()
-
-        for pos in positions:
-            line_num = pos // bytes_per_line
-            byte_in_line = pos % bytes_per_line
-
-            left_text = self.left_hex.toPlainText()
-            right_text = self.right_hex.toPlainText()
-
-            lines = left_text.split('\n')
-            if line_num < len(lines):
-                line = lines[line_num]
-                offset = 10
-                hex_start = offset + byte_in_line * 3
-                if hex_start < len(line):
-                    self._highlight_line(self.left_hex, line_num, hex_start, 2)
-
-            lines = right_text.split('\n')
-            if line_num < len(lines):
-                line = lines[line_num]
-                offset = 10
-                hex_start = offset + byte_in_line * 3
-                if hex_start < len(line):
-                    self._highlight_line(self.right_hex, line_num, hex_start, 2)
-
-    def _highlight_line(self, editor: HexEditor, line_num: int, start_pos: int, length: int):
-        """Highlight a portion of a line in the editor."""
-        cursor = editor.textCursor()
-        block = editor.document().findBlockByNumber(line_num)
-        if block.isValid():
-            cursor.setPosition(block.position() + start_pos)
-            cursor.setPosition(block.position() + start_pos + length, QTextCursor.KeepAnchor)
-            fmt = cursor.charFormat()
-            fmt.setBackground(QColor("#ff6b6b"))
-            cursor.setCharFormat(fmt)
-            editor.setTextCursor(cursor)
+        self.left_hex.set_diff_positions(positions)
+        self.right_hex.set_diff_positions(positions)
+
+        if not self._diff_enabled or not self._left_data or not self._right_data:
+            self.diff_label.clear()
+        elif not total:
+            self.diff_label.setText("No differences")
+        elif total > len(positions):
+            self.diff_label.setText(
+                f"{total} differing bytes (…{total - len(positions)} more not highlighted)"
+            )
+        else:
+            self.diff_label.setText(f"{total} differing bytes")
 
     def clear(self):
         """Clear both panes."""
         self._left_file_path = None
         self._right_file_path = None
-        self._left_data = bytearray()
-        self._right_data = bytearray()
-        self.left_hex.set_data(b"")
-        self.right_hex.set_data(b"")
+        self._load_generation += 1
+        self._load_worker = None
+        self._pending_left_path = None
+        self._pending_right_path = None
+        self._set_left_data(b"")
+        self._set_right_data(b"")
+        self.diff_label.clear()
@@ -10,19 +10,151 @@ logger = logging.getLogger("MergeDiffTool.ImageDiffView")
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QLabel, QFrame,
     QPushButton, QFileDialog, QMessageBox, QSlider,
-    QCheckBox, QComboBox, QSplitter, QScrollArea
+    QCheckBox, QComboBox, QSplitter, QScrollArea, QAbstractScrollArea
+)
+from PySide6.QtCore import (
+    Qt, Signal, QPoint, QRectF, QSize, QTimer, QObject, QRunnable, QThreadPool
 )
-from PySide6.QtCore import Qt, Signal, QPoint, QRectF
 from PySide6.QtGui import (
     QImage, QPixmap, QPainter, QColor, QMouseEvent,
     QWheelEvent, QResizeEvent, QPen, QBrush
 )
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 import os
 
+from src.utils.fastdiff import pixel_diff_flags
+
+
+# Colour table of the Indexed8 diff mask: index 0 is transparent, index 1
+# the highlight colour (red at alpha 200).
+DIFF_MASK_COLORS = [0x00000000, 0xC8FF0000]
+
+# Approximate size of the row bands the diff mask is computed in.
+DIFF_TILE_BYTES = 1 << 20
+
+# Quiet period after the last threshold slider change before the diff is recomputed.
+THRESHOLD_APPLY_DELAY_MS = 100
+
+# Longest side of the thumbnails diffed while the threshold slider is dragged.
+PREVIEW_SIZE = 512
+
+# Quiet period after the last zoom step before images are redrawn smoothly.
+SMOOTH_RENDER_DELAY_MS = 120
+
+
+def compute_diff_mask(left: QImage, right: QImage,
+                      threshold: int) -> Tuple[QImage, int]:
+    """Return the highlight mask of two images and its differing pixel count.
+
+    Both images are cropped to their common size and converted to RGB32.
+    Qt's Difference composition mode produces the absolute per-channel
+    differences in C++, and the thresholding and mask construction work on
+    whole buffers, so no Python code runs per pixel. The buffers are
+    processed in bands of rows of about DIFF_TILE_BYTES, which keeps the
+    temporaries small and cache resident instead of several full-size
+    copies. The mask is an Indexed8 image using DIFF_MASK_COLORS, so the
+    0/1 pixel flags are its data as they are.
+
+    Identical images, which share a cacheKey() or compare equal with a
+    line-by-line memcmp, get an empty mask without any of that work.
+    """
+    width = min(left.width(), right.width())
+    height = min(left.height(), right.height())
+    left = left.convertToFormat(QImage.Format_RGB32)
+    right = right.convertToFormat(QImage.Format_RGB32)
+
+    if left.cacheKey() == right.cacheKey() or left == right:
+        mask = QImage(width, height, QImage.Format_Indexed8)
+        mask.setColorTable(DIFF_MASK_COLORS)
+        mask.fill(0)
+        return mask, 0
+
+    diff = left.copy(0, 0, width, height)
+    painter = QPainter(diff)
+    painter.setCompositionMode(QPainter.CompositionMode_Difference)
+    painter.drawImage(0, 0, right)
+    painter.end()
+
+    stride = 4 * width
+    band_rows = max(1, DIFF_TILE_BYTES // stride)
+    diff_bits = diff.constBits()
+    bands = []
+    count = 0
+    for top in range(0, height, band_rows):
+        start = top * stride
+        end = min(height, top + band_rows) * stride
+        flags = pixel_diff_flags(bytes(diff_bits[start:end]), threshold)
+        bands.append(flags)
+        count += flags.count(1)
+    # The QImage wraps the joined flags without copying them; PySide keeps
+    # a reference to the buffer for as long as the image lives.
+    mask = QImage(b"".join(bands), width, height, width, QImage.Format_Indexed8)
+    mask.setColorTable(DIFF_MASK_COLORS)
+    return mask, count
+
+
+@dataclass
+class ImageDiffResult:
+    """Mask and differing pixel count produced by ImageDiffWorker."""
+    mask: QImage
+    count: int
+    preview: bool
+
+
+class ImageDiffSignals(QObject):
+    """Signals emitted by ImageDiffWorker."""
+
+    finished = Signal(int, object)
+    failed = Signal(int, str)
+
+
+class ImageDiffWorker(QRunnable):
+    """Compute the diff mask of two RGB32 images on a thread pool thread.
+
+    A preview mask is stretched to ``width`` x ``height``, the common area
+    of the full resolution images. Results are delivered together with the
+    generation they were requested for, so the receiver can drop stale ones.
+    """
+
+    def __init__(self, generation: int, left: QImage, right: QImage,
+                 threshold: int, width: int, height: int, preview: bool):
+        super().__init__()
+        self.signals = ImageDiffSignals()
+        self._generation = generation
+        self._left = left
+        self._right = right
+        self._threshold = threshold
+        self._width = width
+        self._height = height
+        self._preview = preview
+
+    def run(self):
+        try:
+            mask, count = compute_diff_mask(self._left, self._right, self._threshold)
+            if self._preview:
+                mask = mask.scaled(
+                    self._width, self._height,
+                    Qt.AspectRatioMode.IgnoreAspectRatio,
+                    Qt.TransformationMode.FastTransformation
+                )
+        except Exception as e:
+            self.signals.failed.emit(self._generation, f"Failed to compare images:\n{e}")
+            return
+        self.signals.finished.emit(
+            self._generation, ImageDiffResult(mask, count, self._preview)
+        )
+
 
 class ImageLabel(QLabel):
-    """Custom label for displaying images with zoom and pan support."""
+    """Custom label for displaying images with zoom and pan support.
+
+    The image is kept as a full resolution pixmap and zoom is applied by
+    the painter in paintEvent, so a zoom step only repaints the visible
+    part of the widget instead of rescaling the whole image.
+    """
+
+    MINIMUM_SIZE = QSize(200, 200)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -33,10 +165,24 @@ class ImageLabel(QLabel):
         self._offset_y = 0
         self._last_mouse_pos = QPoint()
         self._dragging = False
+        # Set when a pixmap update was deferred until the current pan ends.
+        self._pixmap_stale = False
         self._diff_mask = None
         self._show_diff = False
+        # Pixmaps of the plain image and of the image composited with the
+        # diff mask, each with the cacheKey()s it was built from, so toggling
+        # the diff or zooming does not rebuild either.
+        self._image_pixmap = None
+        self._image_pixmap_key = None
+        self._composite_pixmap = None
+        self._composite_key = None
+        # Zoom steps are drawn without smoothing until the zoom settles.
+        self._zooming = False
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(SMOOTH_RENDER_DELAY_MS)
+        self._smooth_timer.timeout.connect(self._finish_zoom)
         self.setAlignment(Qt.AlignCenter)
-        self.setMinimumSize(200, 200)
         self.setStyleSheet("background-color: #2d2d2d; border: 1px solid #444;")
 
     def set_image(self, image: QImage):
@@ -59,9 +205,24 @@ class ImageLabel(QLabel):
         self._update_pixmap()
 
     def set_scale(self, scale: float):
-        """Set the zoom scale factor."""
-        self._scale_factor = max(0.1, min(10.0, scale))
-        self._update_pixmap()
+        """Set the zoom scale factor.
+
+        The image is drawn without smoothing first and redrawn smoothly
+        once no further zoom step has arrived for SMOOTH_RENDER_DELAY_MS.
+        """
+        scale = max(0.1, min(10.0, scale))
+        if scale == self._scale_factor:
+            return
+        self._scale_factor = scale
+        self._zooming = True
+        self._smooth_timer.start()
+        self.updateGeometry()
+        self.update()
+
+    def _finish_zoom(self):
+        """Redraw the image smoothly after zooming has settled."""
+        self._zooming = False
+        self.update()
 
     def get_scale(self) -> float:
         """Get the current scale factor."""
@@ -72,57 +233,128 @@ class ImageLabel(QLabel):
         self._scale_factor = 1.0
         self._offset_x = 0
         self._offset_y = 0
-        self._update_pixmap()
+        self._zooming = False
+        self._smooth_timer.stop()
+        self.updateGeometry()
+        self.update()
+
+    def _scaled_size(self) -> QSize:
+        """Return the size of the pixmap at the current zoom."""
+        if self._pixmap is None:
+            return QSize(0, 0)
+        return self._pixmap.size() * self._scale_factor
+
+    def sizeHint(self) -> QSize:
+        return self._scaled_size().expandedTo(self.MINIMUM_SIZE)
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
 
     def _update_pixmap(self):
-        """Update the displayed pixmap."""
+        """Update the displayed pixmap.
+
+        The plain and composited pixmaps are cached separately and only
+        rebuilt when the image or mask they were made from changes. While
+        the image is being panned the update is deferred until the mouse
+        is released, so a diff finishing mid-drag does not stall the pan.
+        """
+        if self._dragging:
+            self._pixmap_stale = True
+            return
+        self._pixmap_stale = False
         if not self._image:
-            self.clear()
+            self._pixmap = None
+            self._image_pixmap = self._image_pixmap_key = None
+            self._composite_pixmap = self._composite_key = None
+            self.updateGeometry()
+            self.update()
             return
 
         if self._show_diff and self._diff_mask:
-            combined = QImage(self._image.size(), QImage.Format_ARGB32)
-            painter = QPainter(combined)
-            painter.drawImage(0, 0, self._image)
-            painter.setCompositionMode(QPainter.CompositionMode_Multiply)
-            painter.drawImage(0, 0, self._diff_mask)
-            painter.end()
-            source = combined
+            key = (self._image.cacheKey(), self._diff_mask.cacheKey())
+            if key != self._composite_key:
+                combined = self._image.convertToFormat(
+                    QImage.Format_ARGB32_Premultiplied
+                )
+                painter = QPainter(combined)
+                painter.setCompositionMode(QPainter.CompositionMode_Multiply)
+                painter.drawImage(0, 0, self._diff_mask)
+                painter.end()
+                self._composite_pixmap = QPixmap.fromImage(combined)
+                self._composite_key = key
+            pixmap = self._composite_pixmap
         else:
-            source = self._image
+            key = self._image.cacheKey()
+            if key != self._image_pixmap_key:
+                self._image_pixmap = QPixmap.fromImage(self._image)
+                self._image_pixmap_key = key
+            pixmap = self._image_pixmap
 
-        scaled_size = source.size() * self._scale_factor
-        scaled_image = source.scaled(
-            scaled_size,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+        if pixmap is self._pixmap:
+            return
+        self._pixmap = pixmap
+        self.updateGeometry()
+        self.update()
+
+    def paintEvent(self, event):
+        """Draw the frame, then the pixmap scaled and centred by the painter."""
+        super().paintEvent(event)
+        if self._pixmap is None:
+            return
+        scaled = self._scaled_size()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, not self._zooming)
+        painter.translate(
+            max(0, (self.width() - scaled.width()) / 2),
+            max(0, (self.height() - scaled.height()) / 2)
         )
+        painter.scale(self._scale_factor, self._scale_factor)
+        painter.drawPixmap(0, 0, self._pixmap)
+        painter.end()
 
-        self._pixmap = QPixmap.fromImage(scaled_image)
-        self.setPixmap(self._pixmap)
-        self.adjustSize()
+    def _scroll_area(self) -> Optional[QAbstractScrollArea]:
+        """Return the scroll area showing this label, if any."""
+        widget = self.parentWidget()
+        while widget is not None and not isinstance(widget, QAbstractScrollArea):
+            widget = widget.parentWidget()
+        return widget
 
     def mousePressEvent(self, event: QMouseEvent):
         """Handle mouse press events for panning."""
         if event.button() == Qt.LeftButton:
             self._dragging = True
-            self._last_mouse_pos = event.pos()
+            self._last_mouse_pos = event.globalPosition().toPoint()
             self.setCursor(Qt.ClosedHandCursor)
 
     def mouseMoveEvent(self, event: QMouseEvent):
-        """Handle mouse move events for panning."""
+        """Handle mouse move events for panning.
+
+        Inside a scroll area the pan moves its scroll bars, which scrolls
+        the already painted viewport contents and only repaints the newly
+        exposed strip; a free-standing label is moved instead.
+        """
         if self._dragging:
-            delta = event.pos() - self._last_mouse_pos
-            self._offset_x += delta.x()
-            self._offset_y += delta.y()
-            self._last_mouse_pos = event.pos()
-            self.move(self._offset_x, self._offset_y)
+            pos = event.globalPosition().toPoint()
+            delta = pos - self._last_mouse_pos
+            self._last_mouse_pos = pos
+            scroll_area = self._scroll_area()
+            if scroll_area is not None:
+                hbar = scroll_area.horizontalScrollBar()
+                vbar = scroll_area.verticalScrollBar()
+                hbar.setValue(hbar.value() - delta.x())
+                vbar.setValue(vbar.value() - delta.y())
+            else:
+                self._offset_x += delta.x()
+                self._offset_y += delta.y()
+                self.move(self._offset_x, self._offset_y)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         """Handle mouse release events."""
         if event.button() == Qt.LeftButton:
             self._dragging = False
             self.setCursor(Qt.ArrowCursor)
+            if self._pixmap_stale:
+                self._update_pixmap()
 
     def wheelEvent(self, event: QWheelEvent):
         """Handle wheel events for zooming."""
@@ -147,6 +379,21 @@ class ImageDiffView(QWidget):
         self._right_image = None
         self._overlay_mode = False
         self._diff_threshold = 10
+        # RGB32 conversions of the current images, keyed by QImage.cacheKey().
+        self._rgb_cache: Dict[int, QImage] = {}
+        # Thumbnails of the common image area, keyed by both cacheKey()s.
+        self._preview_key: Optional[Tuple[int, int]] = None
+        self._preview_images: Optional[Tuple[QImage, QImage]] = None
+        # Only one diff runs at a time; a request made meanwhile is kept in
+        # _pending_preview (None when nothing is pending) and run afterwards.
+        self._diff_generation = 0
+        self._diff_worker: Optional[ImageDiffWorker] = None
+        self._pending_preview: Optional[bool] = None
+
+        self._threshold_timer = QTimer(self)
+        self._threshold_timer.setSingleShot(True)
+        self._threshold_timer.setInterval(THRESHOLD_APPLY_DELAY_MS)
+        self._threshold_timer.timeout.connect(self._apply_threshold)
 
         logger.debug("Calling _setup_ui...")
         self._setup_ui()
@@ -235,6 +482,7 @@ class ImageDiffView(QWidget):
         self.btn_reset.clicked.connect(self._reset_view)
         self.slider_zoom.valueChanged.connect(self._on_zoom_changed)
         self.slider_threshold.valueChanged.connect(self._on_threshold_changed)
+        self.slider_threshold.sliderReleased.connect(self._on_threshold_released)
 
     def _open_left_image(self):
         """Open an image file for the left pane."""
@@ -288,8 +536,27 @@ class ImageDiffView(QWidget):
         self.right_image_label.set_scale(scale)
 
     def _on_threshold_changed(self, value: int):
-        """Handle diff threshold change."""
+        """Handle diff threshold change.
+
+        While the slider is dragged, a preview diff of small thumbnails is
+        shown for every value. Other changes recompute the full diff once
+        the slider has been still for THRESHOLD_APPLY_DELAY_MS, so stepping
+        it does not run a full comparison for every value passed.
+        """
         self._diff_threshold = value
+        if self.slider_threshold.isSliderDown():
+            if self.btn_diff.isChecked():
+                self._compute_diff(preview=True)
+        else:
+            self._threshold_timer.start()
+
+    def _on_threshold_released(self):
+        """Replace the drag preview with the full resolution diff."""
+        self._threshold_timer.stop()
+        self._apply_threshold()
+
+    def _apply_threshold(self):
+        """Recompute the diff with the current threshold."""
         if self.btn_diff.isChecked():
             self._compute_diff()
 
@@ -301,6 +568,7 @@ class ImageDiffView(QWidget):
             if self._left_image.isNull():
                 raise ValueError("Failed to load image")
             self.left_image_label.set_image(self._left_image)
+            self._diff_generation += 1
             self._update_overlay()
             self.file_loaded.emit(file_path, self._right_file_path or "")
         except Exception as e:
@@ -314,6 +582,7 @@ class ImageDiffView(QWidget):
             if self._right_image.isNull():
                 raise ValueError("Failed to load image")
             self.right_image_label.set_image(self._right_image)
+            self._diff_generation += 1
             self._update_overlay()
             self.file_loaded.emit(self._left_file_path or "", file_path)
         except Exception as e:
@@ -342,6 +611,7 @@ class ImageDiffView(QWidget):
 
         self.left_image_label.set_image(self._left_image)
         self.right_image_label.set_image(self._right_image)
+        self._diff_generation += 1
         self._update_overlay()
         self.file_loaded.emit(left_path, right_path)
 
@@ -350,61 +620,126 @@ class ImageDiffView(QWidget):
         if self._overlay_mode and self._left_image and self._right_image:
             self._compute_diff()
 
-    def _compute_diff(self):
-        """Compute pixel-level differences between images."""
+    def _compute_diff(self, preview: bool = False):
+        """Compute pixel-level differences between images on the thread pool.
+
+        With ``preview`` set, thumbnails no larger than PREVIEW_SIZE are
+        compared instead and the mask is stretched over the common area.
+        While a diff is running, the request is remembered and started once
+        it finishes, so at most one diff is ever in flight.
+        """
         if not self._left_image or not self._right_image:
             return
+        if self._diff_worker is not None:
+            self._pending_preview = preview
+            return
 
-        left = self._left_image.convertToFormat(QImage.Format_ARGB32)
-        right = self._right_image.convertToFormat(QImage.Format_ARGB32)
-
+        left, right = self._rgb_images()
         width = min(left.width(), right.width())
         height = min(left.height(), right.height())
+        if preview and max(width, height) > PREVIEW_SIZE:
+            left, right = self._previews(left, right, width, height)
+        else:
+            preview = False
 
-        diff_mask = QImage(width, height, QImage.Format_ARGB32)
-        diff_mask.fill(QColor(0, 0, 0, 0))
-
-        diff_count = 0
-        threshold = self._diff_threshold
-
-        for y in range(height):
-            for x in range(width):
-                left_pixel = left.pixel(x, y)
-                right_pixel = right.pixel(x, y)
-
-                left_r = (left_pixel >> 16) & 0xFF
-                left_g = (left_pixel >> 8) & 0xFF
-                left_b = left_pixel & 0xFF
-
-                right_r = (right_pixel >> 16) & 0xFF
-                right_g = (right_pixel >> 8) & 0xFF
-                right_b = right_pixel & 0xFF
-
-                diff_r = abs(left_r - right_r)
-                diff_g = abs(left_g - right_g)
-                diff_b = abs(left_b - right_b)
-
-                if diff_r > threshold or diff_g > threshold or diff_b > threshold:
-                    diff_mask.setPixel(x, y, QColor(255, 0, 0, 200).rgba())
-                    diff_count += 1
-
-        self.left_image_label.set_diff_mask(diff_mask)
-        self.right_image_label.set_diff_mask(diff_mask)
+        worker = ImageDiffWorker(
+            self._diff_generation, left, right, self._diff_threshold,
+            width, height, preview,
+        )
+        worker.signals.finished.connect(self._on_diff_finished)
+        worker.signals.failed.connect(self._on_diff_failed)
+        self._diff_worker = worker
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_diff_finished(self, generation: int, result: ImageDiffResult):
+        """Show a finished diff, then start the request made meanwhile."""
+        self._diff_worker = None
+        if generation == self._diff_generation:
+            self._show_diff_result(result)
+        self._start_pending_diff()
+
+    def _on_diff_failed(self, generation: int, message: str):
+        """Report a failed diff, then start the request made meanwhile."""
+        self._diff_worker = None
+        if generation == self._diff_generation:
+            QMessageBox.critical(self, "Error", message)
+        self._start_pending_diff()
+
+    def _start_pending_diff(self):
+        """Start the diff requested while the previous one was running."""
+        if self._pending_preview is not None:
+            preview = self._pending_preview
+            self._pending_preview = None
+            self._compute_diff(preview)
+
+    def is_computing_diff(self) -> bool:
+        """Check if a diff is being computed in the background."""
+        return self._diff_worker is not None
+
+    def _show_diff_result(self, result: ImageDiffResult):
+        """Apply a diff mask to both panes and report the difference count.
+
+        The status bar is left alone for previews, whose count is only
+        approximate.
+        """
+        self.left_image_label.set_diff_mask(result.mask)
+        self.right_image_label.set_diff_mask(result.mask)
+        if result.preview:
+            return
 
+        diff_count = result.count
         if diff_count > 0:
-            diff_percentage = (diff_count / (width * height)) * 100
+            diff_percentage = (diff_count / (result.mask.width() * result.mask.height())) * 100
             self.parent().statusBar().showMessage(
                 f"Found {diff_count} differing pixels ({diff_percentage:.2f}%)"
             )
         else:
             self.parent().statusBar().showMessage("Images are identical")
 
+    def _rgb_images(self) -> Tuple[QImage, QImage]:
+        """Return both images in RGB32, converting each only when it changes.
+
+        Only conversions of the current images are kept, so replacing an
+        image drops its stale conversion on the next diff.
+        """
+        cache = {}
+        for image in (self._left_image, self._right_image):
+            key = image.cacheKey()
+            converted = self._rgb_cache.get(key)
+            if converted is None:
+                converted = image.convertToFormat(QImage.Format_RGB32)
+            cache[key] = converted
+        self._rgb_cache = cache
+        return cache[self._left_image.cacheKey()], cache[self._right_image.cacheKey()]
+
+    def _previews(self, left: QImage, right: QImage,
+                  width: int, height: int) -> Tuple[QImage, QImage]:
+        """Return thumbnails of the common area of both RGB32 images."""
+        key = (left.cacheKey(), right.cacheKey())
+        if self._preview_key != key:
+            self._preview_images = tuple(
+                image.copy(0, 0, width, height).scaled(
+                    PREVIEW_SIZE, PREVIEW_SIZE,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.FastTransformation
+                )
+                for image in (left, right)
+            )
+            self._preview_key = key
+        return self._preview_images
+
     def clear(self):
         """Clear both panes."""
+        self._threshold_timer.stop()
+        self._diff_generation += 1
+        self._pending_preview = None
         self._left_file_path = None
         self._right_file_path = None
         self._left_image = None
         self._right_image = None
+        self._rgb_cache = {}
+        self._preview_key = None
+        self._preview_images = None
         self.left_image_label.set_image(None)
         self.right_image_label.set_image(None)
         self.left_image_label.set_diff_mask(None)
@@ -6,6 +6,7 @@ Uses PySide6 for the GUI framework (LGPL licensed).
 
 import logging
 import os
+from typing import Dict, List, Optional
 logger = logging.getLogger("MergeDiffTool.MainWindow")
 
 from PySide6.QtWidgets import (
@@ -14,20 +15,76 @@ from PySide6.QtWidgets import (
     QStatusBar, QFileDialog, QMessageBox, QTabWidget,
     QWidgetAction, QLineEdit, QComboBox
 )
-from PySide6.QtCore import Qt, QSize, Signal, QPoint
+from PySide6.QtCore import (
+    Qt, QSize, Signal, Slot, QPoint, QTimer, QObject, QRunnable, QThreadPool
+)
 from PySide6.QtGui import QAction
 from src.gui.diff_view import DiffView
-from src.gui.file_tree import FileTreeView
-from src.gui.three_way_merge import ThreeWayMergeView
 from src.gui.hex_view import HexView
 from src.gui.image_diff_view import ImageDiffView
 from src.gui.theme_manager import get_theme_manager
-from src.utils.config import load_config, save_config, AppConfig, add_recent_file, add_recent_folder
+from src.utils.config import (
+    load_config, save_config, config_to_dict, write_config_dict, AppConfig,
+    add_recent_file, add_recent_folder
+)
+
+
+class ConfigSaveWorker(QRunnable):
+    """Write a configuration snapshot on a thread pool thread.
+
+    The snapshot is taken on the GUI thread, so the worker never touches
+    the live config object.
+    """
+
+    def __init__(self, config_dict: dict):
+        super().__init__()
+        self._config_dict = config_dict
+
+    def run(self):
+        try:
+            write_config_dict(self._config_dict)
+        except Exception as e:
+            logger.error(f"Failed to save config: {e}")
+
+
+class PathCheckSignals(QObject):
+    """Signals emitted by PathCheckWorker."""
+
+    finished = Signal(object)
+
+
+class PathCheckWorker(QRunnable):
+    """Check which of a list of paths exist on a thread pool thread.
+
+    Recent entries may live on slow or disconnected network drives, so the
+    stat calls are kept off the GUI thread. The result maps each path to
+    whether it exists.
+    """
+
+    def __init__(self, paths: List[str]):
+        super().__init__()
+        self.signals = PathCheckSignals()
+        self._paths = paths
+
+    def run(self):
+        self.signals.finished.emit({path: os.path.exists(path) for path in self._paths})
 
 
 class MainWindow(QMainWindow):
     """Main application window."""
 
+    ABOUT_TEXT = (
+        "Merge & Diff Tool\n\n"
+        "A WinMerge-like GUI tool for comparing and merging files.\n\n"
+        "Features:\n"
+        "- Side-by-side diff view\n"
+        "- Inline character-level diff\n"
+        "- Three-way merge for conflict resolution\n"
+        "- File filters\n"
+        "- Directory comparison\n\n"
+        "Built with Python and PySide6."
+    )
+
     def __init__(self):
         super().__init__()
         logger.info("Initializing MainWindow...")
@@ -35,16 +92,22 @@ class MainWindow(QMainWindow):
         self.config = load_config()
         self._theme_manager = get_theme_manager()
         self._three_way_merge_view = None
-        self._recent_file_actions = []
-        self._recent_folder_actions = []
+        # The recent menus are rebuilt when next shown, not on every change.
+        self._recent_files_dirty = True
+        self._recent_folders_dirty = True
+        # Existence of recent paths, dropped and re-checked off-thread whenever a recent menu opens.
+        self._path_exists_cache: Dict[str, bool] = {}
+        # Created on first use and reused, so only the first open pays for building it.
+        self._open_dialog: Optional[QFileDialog] = None
+        # Work that can wait until the window has been shown runs once, from showEvent.
+        self._deferred_init_done = False
 
         try:
             self.setWindowTitle("Merge & Diff Tool")
             self.setMinimumSize(QSize(800, 600))
             self._current_diff_result = None
 
-            if hasattr(self.config, 'window_x') and hasattr(self.config, 'window_y'):
-                self.move(self.config.window_x, self.config.window_y)
+            self.move(self.config.window_x, self.config.window_y)
             self.resize(self.config.window_width, self.config.window_height)
             if self.config.window_maximized:
                 self.setWindowState(Qt.WindowState.WindowMaximized)
@@ -61,9 +124,6 @@ class MainWindow(QMainWindow):
             self._setup_connections()
             logger.info("Connections setup completed")
 
-            self._update_recent_files_menu()
-            self._update_recent_folders_menu()
-
             logger.info("MainWindow initialization complete")
         except Exception as e:
             logger.error(f"Error initializing MainWindow: {e}")
@@ -71,6 +131,18 @@ class MainWindow(QMainWindow):
             logger.error(traceback.format_exc())
             raise
 
+    def showEvent(self, event):
+        """Start deferred startup work once the window is first shown."""
+        super().showEvent(event)
+        if not self._deferred_init_done:
+            self._deferred_init_done = True
+            QTimer.singleShot(0, self._finish_deferred_init)
+
+    @Slot()
+    def _finish_deferred_init(self):
+        """Check the recent paths in the background after the first paint."""
+        self._check_recent_paths(self.config.recent_files + self.config.recent_folders)
+
     def _setup_ui(self):
         """Set up the user interface."""
         central_widget = QWidget()
@@ -131,7 +203,9 @@ class MainWindow(QMainWindow):
         file_menu.addSeparator()
 
         self.recent_files_menu = file_menu.addMenu("Recent &Files")
+        self.recent_files_menu.addAction("(No recent files)").setEnabled(False)
         self.recent_folders_menu = file_menu.addMenu("Recent F&olders")
+        self.recent_folders_menu.addAction("(No recent folders)").setEnabled(False)
 
         file_menu.addSeparator()
 
@@ -321,59 +395,67 @@ class MainWindow(QMainWindow):
         toolbar.setMovable(False)
         self.addToolBar(toolbar)
 
-        toolbar.addAction(self._actions["open_left"])
-        toolbar.addAction(self._actions["open_right"])
+        actions = self._actions
+
+        toolbar.addAction(actions["open_left"])
+        toolbar.addAction(actions["open_right"])
         toolbar.addSeparator()
-        toolbar.addAction(self._actions["undo"])
-        toolbar.addAction(self._actions["redo"])
+        toolbar.addAction(actions["undo"])
+        toolbar.addAction(actions["redo"])
         toolbar.addSeparator()
-        toolbar.addAction(self._actions["copy_left"])
-        toolbar.addAction(self._actions["copy_right"])
+        toolbar.addAction(actions["copy_left"])
+        toolbar.addAction(actions["copy_right"])
         toolbar.addSeparator()
-        toolbar.addAction(self._actions["next_diff"])
-        toolbar.addAction(self._actions["prev_diff"])
+        toolbar.addAction(actions["next_diff"])
+        toolbar.addAction(actions["prev_diff"])
         toolbar.addSeparator()
-        toolbar.addAction(self._actions["inline_diff"])
-        toolbar.addAction(self._actions["column_edit"])
+        toolbar.addAction(actions["inline_diff"])
+        toolbar.addAction(actions["column_edit"])
         toolbar.addSeparator()
-        toolbar.addAction(self._actions["ignore_whitespace"])
-        toolbar.addAction(self._actions["ignore_case"])
+        toolbar.addAction(actions["ignore_whitespace"])
+        toolbar.addAction(actions["ignore_case"])
 
     def _setup_connections(self):
         """Set up signal/slot connections."""
-        self._actions["open_left"].triggered.connect(self._open_left_file)
-        self._actions["open_right"].triggered.connect(self._open_right_file)
-        self._actions["compare_folders"].triggered.connect(self._compare_folders)
-        self._actions["save_merged"].triggered.connect(self._save_merged)
-        self._actions["export_html"].triggered.connect(lambda: self._export_report("html"))
-        self._actions["export_text"].triggered.connect(lambda: self._export_report("text"))
-        self._actions["export_unified"].triggered.connect(lambda: self._export_report("unified"))
-        self._actions["export_json"].triggered.connect(lambda: self._export_report("json"))
-        self._actions["exit"].triggered.connect(self.close)
-        self._actions["undo"].triggered.connect(self._undo)
-        self._actions["redo"].triggered.connect(self._redo)
-        self._actions["copy_left"].triggered.connect(self._copy_to_left)
-        self._actions["copy_right"].triggered.connect(self._copy_to_right)
-        self._actions["copy_all_left"].triggered.connect(self._copy_all_to_left)
-        self._actions["copy_all_right"].triggered.connect(self._copy_all_to_right)
-        self._actions["next_diff"].triggered.connect(self._next_difference)
-        self._actions["prev_diff"].triggered.connect(self._prev_difference)
-        self._actions["toggle_folders"].triggered.connect(self._toggle_folder_view)
-        self._actions["about"].triggered.connect(self._show_about)
-        self._actions["open_three_way"].triggered.connect(self._open_three_way_merge)
-        self._actions["open_hex_view"].triggered.connect(self._open_hex_view)
-        self._actions["open_image_diff"].triggered.connect(self._open_image_diff)
-        self._actions["inline_diff"].triggered.connect(self._toggle_inline_diff)
-        self._actions["column_edit"].triggered.connect(self._toggle_column_edit)
-        self._actions["connecting_lines"].triggered.connect(self._toggle_connecting_lines)
-        self._actions["syntax_highlighting"].triggered.connect(self._toggle_syntax_highlighting)
-        self._actions["find"].triggered.connect(self._show_find)
-        self._actions["replace"].triggered.connect(self._show_replace)
-        self._actions["ignore_whitespace"].triggered.connect(self._toggle_ignore_whitespace)
-        self._actions["ignore_case"].triggered.connect(self._toggle_ignore_case)
-        self._actions["ignore_blank_lines"].triggered.connect(self._toggle_ignore_blank_lines)
-        self._actions["ignore_comments"].triggered.connect(self._toggle_ignore_comments)
-        self._actions["align_lines"].triggered.connect(self._align_lines)
+        actions = self._actions
+        actions["open_left"].triggered.connect(self._open_left_file)
+        actions["open_right"].triggered.connect(self._open_right_file)
+        actions["compare_folders"].triggered.connect(self._compare_folders)
+        actions["save_merged"].triggered.connect(self._save_merged)
+        actions["export_html"].triggered.connect(lambda: self._export_report("html"))
+        actions["export_text"].triggered.connect(lambda: self._export_report("text"))
+        actions["export_unified"].triggered.connect(lambda: self._export_report("unified"))
+        actions["export_json"].triggered.connect(lambda: self._export_report("json"))
+        actions["exit"].triggered.connect(self.close)
+        actions["undo"].triggered.connect(self._undo)
+        actions["redo"].triggered.connect(self._redo)
+        actions["copy_left"].triggered.connect(self._copy_to_left)
+        actions["copy_right"].triggered.connect(self._copy_to_right)
+        actions["copy_all_left"].triggered.connect(self._copy_all_to_left)
+        actions["copy_all_right"].triggered.connect(self._copy_all_to_right)
+        actions["next_diff"].triggered.connect(self._next_difference)
+        actions["prev_diff"].triggered.connect(self._prev_difference)
+        actions["toggle_folders"].triggered.connect(self._toggle_folder_view)
+        actions["about"].triggered.connect(self._show_about)
+        actions["open_three_way"].triggered.connect(self._open_three_way_merge)
+        actions["open_hex_view"].triggered.connect(self._open_hex_view)
+        actions["open_image_diff"].triggered.connect(self._open_image_diff)
+        actions["inline_diff"].triggered.connect(self._toggle_inline_diff)
+        actions["column_edit"].triggered.connect(self._toggle_column_edit)
+        actions["connecting_lines"].triggered.connect(self._toggle_connecting_lines)
+        actions["syntax_highlighting"].triggered.connect(self._toggle_syntax_highlighting)
+        actions["find"].triggered.connect(self._show_find)
+        actions["replace"].triggered.connect(self._show_replace)
+        actions["ignore_whitespace"].triggered.connect(self._toggle_ignore_whitespace)
+        actions["ignore_case"].triggered.connect(self._toggle_ignore_case)
+        actions["ignore_blank_lines"].triggered.connect(self._toggle_ignore_blank_lines)
+        actions["ignore_comments"].triggered.connect(self._toggle_ignore_comments)
+        actions["align_lines"].triggered.connect(self._align_lines)
+
+        self.recent_files_menu.aboutToShow.connect(self._refresh_recent_files_menu)
+        self.recent_folders_menu.aboutToShow.connect(self._refresh_recent_folders_menu)
+        self.recent_files_menu.triggered.connect(self._on_recent_file_triggered)
+        self.recent_folders_menu.triggered.connect(self._on_recent_folder_triggered)
 
         self.tab_widget.tabCloseRequested.connect(self._close_tab)
 
@@ -381,28 +463,54 @@ class MainWindow(QMainWindow):
 
         self._update_undo_redo_actions()
 
+    def _get_open_file_name(self, caption: str, name_filter: str) -> str:
+        """Ask for an existing file with the shared open dialog.
+
+        Prompts with more than one name filter use Qt's own dialog rather
+        than the native one, which can load shell extensions synchronously
+        the first time it opens. Returns the selected path, or an empty
+        string if the dialog was cancelled.
+        """
+        dialog = self._open_dialog
+        if dialog is None:
+            dialog = self._open_dialog = QFileDialog(self)
+            dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+            dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptOpen)
+        filters = name_filter.split(";;")
+        dialog.setOption(QFileDialog.Option.DontUseNativeDialog, len(filters) > 1)
+        dialog.setWindowTitle(caption)
+        dialog.setNameFilters(filters)
+        # Do not carry the previous prompt's selection over to this one.
+        dialog.selectNameFilter(filters[0])
+        dialog.selectFile("")
+        if dialog.exec() != QFileDialog.DialogCode.Accepted:
+            return ""
+        selected = dialog.selectedFiles()
+        return selected[0] if selected else ""
+
+    @Slot()
     def _open_left_file(self):
         """Open a file for the left pane."""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Left File", "", "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
+        file_path = self._get_open_file_name(
+            "Open Left File", "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
         )
         if file_path:
             self.diff_view.set_left_file(file_path)
-            add_recent_file(self.config, file_path)
-            self._update_recent_files_menu()
+            self._push_recent_file(file_path)
             self.status_bar.showMessage(f"Opened: {file_path}")
 
+    @Slot()
     def _open_right_file(self):
         """Open a file for the right pane."""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Right File", "", "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
+        file_path = self._get_open_file_name(
+            "Open Right File", "All Files (*);;Text Files (*.txt);;Python Files (*.py)"
         )
         if file_path:
             self.diff_view.set_right_file(file_path)
-            add_recent_file(self.config, file_path)
-            self._update_recent_files_menu()
+            self._push_recent_file(file_path)
             self.status_bar.showMessage(f"Opened: {file_path}")
 
+    @Slot()
     def _save_merged(self):
         """Save the merged result."""
         self.diff_view.save_merged()
@@ -411,18 +519,21 @@ class MainWindow(QMainWindow):
         """Export diff report in specified format."""
         self.diff_view.export_report(format)
 
+    @Slot()
     def _undo(self):
         """Undo the last action."""
         if self.diff_view.undo():
             undo_desc = self.diff_view.get_undo_description()
             self.status_bar.showMessage(f"Undo: {undo_desc}")
 
+    @Slot()
     def _redo(self):
         """Redo the last undone action."""
         if self.diff_view.redo():
             redo_desc = self.diff_view.get_redo_description()
             self.status_bar.showMessage(f"Redo: {redo_desc}")
 
+    @Slot()
     def _update_undo_redo_actions(self):
         """Update the enabled/disabled state of undo/redo actions."""
         can_undo = self.diff_view.can_undo()
@@ -430,34 +541,42 @@ class MainWindow(QMainWindow):
         self._actions["undo"].setEnabled(can_undo)
         self._actions["redo"].setEnabled(can_redo)
 
+    @Slot()
     def _copy_to_left(self):
         """Copy selected changes to left pane."""
         self.diff_view.copy_to_left()
 
+    @Slot()
     def _copy_to_right(self):
         """Copy selected changes to right pane."""
         self.diff_view.copy_to_right()
 
+    @Slot()
     def _copy_all_to_left(self):
         """Copy all changes to left pane."""
         self.diff_view.copy_all_to_left()
 
+    @Slot()
     def _copy_all_to_right(self):
         """Copy all changes to right pane."""
         self.diff_view.copy_all_to_right()
 
+    @Slot()
     def _next_difference(self):
         """Navigate to next difference."""
         self.diff_view.next_difference()
 
+    @Slot()
     def _prev_difference(self):
         """Navigate to previous difference."""
         self.diff_view.prev_difference()
 
+    @Slot(bool)
     def _toggle_folder_view(self, checked):
         """Toggle the folder comparison view."""
         pass
 
+    @Slot()
     def _compare_folders(self):
         """Open both left and right folders for comparison."""
         left_folder = QFileDialog.getExistingDirectory(
@@ -474,49 +593,41 @@ class MainWindow(QMainWindow):
         if not right_folder:
             return
 
-        add_recent_folder(self.config, left_folder)
-        add_recent_folder(self.config, right_folder)
-        self._update_recent_folders_menu()
+        self._push_recent_folder(left_folder)
+        self._push_recent_folder(right_folder)
 
         self.status_bar.showMessage(f"Comparing folders: {left_folder} vs {right_folder}")
 
+    @Slot()
     def _show_about(self):
         """Show the about dialog."""
-        QMessageBox.about(
-            self,
-            "About Merge & Diff Tool",
-            "Merge & Diff Tool\n\n"
-            "A WinMerge-like GUI tool for comparing and merging files.\n\n"
-            "Features:\n"
-            "- Side-by-side diff view\n"
-            "- Inline character-level diff\n"
-            "- Three-way merge for conflict resolution\n"
-            "- File filters\n"
-            "- Directory comparison\n\n"
-            "Built with Python and PySide6."
-        )
+        QMessageBox.about(self, "About Merge & Diff Tool", self.ABOUT_TEXT)
 
+    @Slot()
     def _open_three_way_merge(self):
         """Open three-way merge dialog."""
-        base_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Base File (Optional)", "", "All Files (*)"
+        base_path = self._get_open_file_name(
+            "Select Base File (Optional)", "All Files (*)"
         )
 
-        left_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Left File (Current/HEAD)", "", "All Files (*)"
+        left_path = self._get_open_file_name(
+            "Select Left File (Current/HEAD)", "All Files (*)"
         )
 
         if not left_path:
             return
 
-        right_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Right File (Incoming)", "", "All Files (*)"
+        right_path = self._get_open_file_name(
+            "Select Right File (Incoming)", "All Files (*)"
         )
 
         if not right_path:
             return
 
         if self._three_way_merge_view is None:
+            # Imported here so the merge view's module is only loaded when
+            # a 3-way merge is first opened.
+            from src.gui.three_way_merge import ThreeWayMergeView
             self._three_way_merge_view = ThreeWayMergeView()
             self._three_way_merge_view.merge_complete.connect(self._on_merge_complete)
 
@@ -530,6 +641,7 @@ class MainWindow(QMainWindow):
 
         self.status_bar.showMessage(f"3-Way Merge: {left_path} vs {right_path}")
 
+    @Slot()
     def _open_hex_view(self):
         """Open hex view tab."""
         hex_view = HexView()
@@ -537,6 +649,7 @@ class MainWindow(QMainWindow):
         self.tab_widget.setCurrentIndex(tab_index)
         self.status_bar.showMessage("Hex View opened")
 
+    @Slot()
     def _open_image_diff(self):
         """Open image diff view tab."""
         image_diff_view = ImageDiffView()
@@ -544,6 +657,7 @@ class MainWindow(QMainWindow):
         self.tab_widget.setCurrentIndex(tab_index)
         self.status_bar.showMessage("Image Diff View opened")
 
+    @Slot(str)
     def _on_merge_complete(self, file_path: str):
         """Handle merge completion."""
         QMessageBox.information(
@@ -551,10 +665,12 @@ class MainWindow(QMainWindow):
             f"Merged file saved to: {file_path}"
         )
 
+    @Slot(bool)
     def _toggle_inline_diff(self, checked):
         """Toggle inline character-level diff mode."""
         self.diff_view.set_inline_mode(checked)
 
+    @Slot(bool)
     def _toggle_column_edit(self, checked):
         """Toggle column edit mode."""
         self.diff_view.set_column_mode(checked)
@@ -563,43 +679,53 @@ class MainWindow(QMainWindow):
         else:
             self.status_bar.showMessage("Column Edit Mode disabled")
 
+    @Slot(bool)
     def _toggle_connecting_lines(self, checked):
         """Toggle connecting lines."""
         self.diff_view.set_connecting_lines_enabled(checked)
 
+    @Slot(bool)
     def _toggle_syntax_highlighting(self, checked):
         """Toggle syntax highlighting."""
         self.diff_view.set_syntax_highlighting_enabled(checked)
 
+    @Slot()
     def _show_find(self):
         """Show find dialog."""
         self.diff_view.show_search_bar()
 
+    @Slot()
     def _show_replace(self):
         """Show replace dialog."""
         self.diff_view.show_search_bar()
 
+    @Slot(bool)
     def _toggle_ignore_whitespace(self, checked):
         """Toggle ignore whitespace option."""
         self.diff_view.set_ignore_whitespace(checked)
 
+    @Slot(bool)
     def _toggle_ignore_case(self, checked):
         """Toggle ignore case option."""
         self.diff_view.set_ignore_case(checked)
 
+    @Slot(bool)
     def _toggle_ignore_blank_lines(self, checked):
         """Toggle ignore blank lines option."""
         self.diff_view.set_ignore_blank_lines(checked)
 
+    @Slot(bool)
     def _toggle_ignore_comments(self, checked):
         """Toggle ignore comments option."""
         self.diff_view.set_ignore_comments(checked)
 
+    @Slot()
     def _align_lines(self):
         """Align lines to improve diff accuracy."""
         self.diff_view.align_lines()
         self.status_bar.showMessage("Lines aligned")
 
+    @Slot(int)
     def _close_tab(self, index):
         """Close a tab."""
         widget = self.tab_widget.widget(index)
@@ -607,6 +733,7 @@ class MainWindow(QMainWindow):
             self._three_way_merge_view = None
         self.tab_widget.removeTab(index)
 
+    @Slot(QPoint)
     def _show_tab_context_menu(self, position: QPoint):
         """Show context menu for tabs."""
         tab_index = self.tab_widget.tabBar().tabAt(position)
@@ -637,6 +764,7 @@ class MainWindow(QMainWindow):
 
         menu.exec(self.tab_widget.tabBar().mapToGlobal(position))
 
+    @Slot()
     def _new_diff_tab(self):
         """Create a new diff view tab."""
         new_diff_view = DiffView()
@@ -660,6 +788,7 @@ class MainWindow(QMainWindow):
             if i != keep_index:
                 self._close_tab(i)
 
+    @Slot()
     def _close_all_tabs(self):
         """Close all tabs."""
         for i in range(self.tab_widget.count() - 1, -1, -1):
@@ -680,37 +809,110 @@ class MainWindow(QMainWindow):
         self.action_dracula_theme.setChecked(current_theme.name == "Dracula")
         self.action_nord_theme.setChecked(current_theme.name == "Nord")
 
+    def _push_recent_file(self, file_path: str):
+        """Record an opened file; the recent files menu is rebuilt when next shown."""
+        add_recent_file(self.config, file_path)
+        self._path_exists_cache[file_path] = True
+        self._recent_files_dirty = True
+
+    def _push_recent_folder(self, folder_path: str):
+        """Record an opened folder; the recent folders menu is rebuilt when next shown."""
+        add_recent_folder(self.config, folder_path)
+        self._path_exists_cache[folder_path] = True
+        self._recent_folders_dirty = True
+
+    @Slot()
+    def _refresh_recent_files_menu(self):
+        """Rebuild the recent files menu before it is shown, if it changed."""
+        if self._recent_files_dirty:
+            self._update_recent_files_menu()
+        self._check_recent_paths(self.config.recent_files)
+
+    @Slot()
+    def _refresh_recent_folders_menu(self):
+        """Rebuild the recent folders menu before it is shown, if it changed."""
+        if self._recent_folders_dirty:
+            self._update_recent_folders_menu()
+        self._check_recent_paths(self.config.recent_folders)
+
     def _update_recent_files_menu(self):
         """Update the recent files menu."""
+        self._recent_files_dirty = False
+        # The entries are parented to the menu, so clear() deletes them.
         self.recent_files_menu.clear()
-        self._recent_file_actions = []
 
         for file_path in self.config.recent_files:
             action = self.recent_files_menu.addAction(file_path)
-            action.triggered.connect(lambda checked, path=file_path: self._open_recent_file(path))
-            self._recent_file_actions.append(action)
+            action.setData(file_path)
+            action.setEnabled(self._path_exists_cache.get(file_path, True))
 
-        if not self._recent_file_actions:
+        if not self.config.recent_files:
             empty_action = self.recent_files_menu.addAction("(No recent files)")
             empty_action.setEnabled(False)
 
     def _update_recent_folders_menu(self):
         """Update the recent folders menu."""
+        self._recent_folders_dirty = False
+        # The entries are parented to the menu, so clear() deletes them.
         self.recent_folders_menu.clear()
-        self._recent_folder_actions = []
 
         for folder_path in self.config.recent_folders:
             action = self.recent_folders_menu.addAction(folder_path)
-            action.triggered.connect(lambda checked, path=folder_path: self._open_recent_folder(path))
-            self._recent_folder_actions.append(action)
+            action.setData(folder_path)
+            action.setEnabled(self._path_exists_cache.get(folder_path, True))
 
-        if not self._recent_folder_actions:
+        if not self.config.recent_folders:
             empty_action = self.recent_folders_menu.addAction("(No recent folders)")
             empty_action.setEnabled(False)
 
+    def _check_recent_paths(self, paths: List[str]):
+        """Refresh the existence cache for recent paths in the background.
+
+        The paths' cached answers are dropped first, so until the check
+        reports back, opening one of them stats it again instead of trusting
+        a result from an earlier check.
+        """
+        if not paths:
+            return
+        for path in paths:
+            self._path_exists_cache.pop(path, None)
+        worker = PathCheckWorker(list(paths))
+        worker.signals.finished.connect(self._on_recent_paths_checked)
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot(object)
+    def _on_recent_paths_checked(self, exists: Dict[str, bool]):
+        """Store checked paths and grey out recent entries that are missing."""
+        self._path_exists_cache.update(exists)
+        for action in self.recent_files_menu.actions() + self.recent_folders_menu.actions():
+            path = action.data()
+            if path in exists:
+                action.setEnabled(exists[path])
+
+    def _cached_exists(self, path: str) -> bool:
+        """Return whether a path exists, using the background check if available."""
+        exists = self._path_exists_cache.get(path)
+        if exists is None:
+            exists = self._path_exists_cache[path] = os.path.exists(path)
+        return exists
+
+    @Slot(QAction)
+    def _on_recent_file_triggered(self, action: QAction):
+        """Open the recent file stored in the triggered menu action."""
+        file_path = action.data()
+        if file_path:
+            self._open_recent_file(file_path)
+
+    @Slot(QAction)
+    def _on_recent_folder_triggered(self, action: QAction):
+        """Open the recent folder stored in the triggered menu action."""
+        folder_path = action.data()
+        if folder_path:
+            self._open_recent_folder(folder_path)
+
     def _open_recent_file(self, file_path: str):
         """Open a recent file."""
-        if os.path.exists(file_path):
+        if self._cached_exists(file_path):
             self.diff_view.set_right_file(file_path)
             self.status_bar.showMessage(f"Opened: {file_path}")
         else:
@@ -721,11 +923,11 @@ class MainWindow(QMainWindow):
             if file_path in self.config.recent_files:
                 self.config.recent_files.remove(file_path)
                 save_config(self.config)
-                self._update_recent_files_menu()
+                self._recent_files_dirty = True
 
     def _open_recent_folder(self, folder_path: str):
         """Open a recent folder."""
-        if os.path.exists(folder_path):
+        if self._cached_exists(folder_path):
             self.status_bar.showMessage(f"Recent folder: {folder_path}")
         else:
             QMessageBox.warning(
@@ -735,7 +937,7 @@ class MainWindow(QMainWindow):
             if folder_path in self.config.recent_folders:
                 self.config.recent_folders.remove(folder_path)
                 save_config(self.config)
-                self._update_recent_folders_menu()
+                self._recent_folders_dirty = True
 
     def closeEvent(self, event):
         """Handle window close event."""
@@ -744,6 +946,7 @@ class MainWindow(QMainWindow):
         self.config.window_x = self.x()
         self.config.window_y = self.y()
         self.config.window_maximized = self.isMaximized()
-        save_config(self.config)
+        # The file write happens off the GUI thread so the window closes at once.
+        QThreadPool.globalInstance().start(ConfigSaveWorker(config_to_dict(self.config)))
         self.diff_view.clear_history()
         super().closeEvent(event)
@@ -5,6 +5,7 @@ Provides find and replace functionality with support for regex,
 case sensitivity, and whole word matching.
 """
 
+import functools
 import re
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QLineEdit, QPushButton,
@@ -215,9 +216,14 @@ class SearchHelper:
     """Helper class for search operations."""
 
     @staticmethod
+    @functools.lru_cache(maxsize=32)
     def build_pattern(search_text: str, case_sensitive: bool, 
                      whole_word: bool, use_regex: bool) -> re.Pattern:
-        """Build a regex pattern for searching."""
+        """Build a regex pattern for searching.
+        
+        Patterns are cached, so repeated searches and replaces within a
+        session reuse the compiled regex.
+        """
         if not use_regex:
             search_text = re.escape(search_text)
         
@@ -238,6 +244,17 @@ class SearchHelper:
             matches = list(pattern.finditer(text, 0, start_pos))
             return matches[-1].start() if matches else -1
 
+    @staticmethod
+    def is_literal_search(case_sensitive: bool, whole_word: bool,
+                          use_regex: bool) -> bool:
+        """Check if a search can be done with plain substring matching."""
+        return case_sensitive and not whole_word and not use_regex
+
+    @staticmethod
+    def find_literal(text: str, search_text: str, start_pos: int = 0) -> int:
+        """Find a literal substring in text starting from position."""
+        return text.find(search_text, start_pos)
+
     @staticmethod
     def replace_in_text(text: str, pattern: re.Pattern, 
                         replacement: str) -> str:
@@ -8,10 +8,94 @@ and settings persistence similar to WinMerge.
 import os
 import json
 import re
+import fnmatch
+import functools
+import threading
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 
 
+_GLOB_METACHARS = frozenset("*?[")
+
+# Key that marks the end of a pattern inside a pattern trie.
+_TRIE_END = ""
+
+
+def _trie_insert(trie: dict, key: str):
+    """Add a key to a dict-of-dicts character trie."""
+    node = trie
+    for ch in key:
+        node = node.setdefault(ch, {})
+    node[_TRIE_END] = True
+
+
+def _trie_has_prefix_of(trie: dict, chars) -> bool:
+    """Check if any key in the trie is a prefix of the character sequence."""
+    node = trie
+    for ch in chars:
+        if _TRIE_END in node:
+            return True
+        node = node.get(ch)
+        if node is None:
+            return False
+    return _TRIE_END in node
+
+
+class GlobMatcher:
+    """Case-insensitive matcher for a list of glob patterns.
+
+    Patterns are bucketed once when the matcher is built: literal names go
+    into a set, ``*suffix`` patterns (the common ``*.ext`` case) into a
+    tuple checked with a single ``str.endswith`` call, ``prefix*`` patterns
+    into a character trie, and only the remaining general globs are
+    translated into a single alternation regex.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = list(patterns)
+        self._exact = set()
+        self._prefix_trie: dict = {}
+        suffixes = []
+        general = []
+        for pattern in self.patterns:
+            pattern = pattern.lower()
+            if not _GLOB_METACHARS.intersection(pattern):
+                self._exact.add(pattern)
+            elif (pattern.startswith("*")
+                  and not _GLOB_METACHARS.intersection(pattern[1:])):
+                suffixes.append(pattern[1:])
+            elif (pattern.endswith("*")
+                  and not _GLOB_METACHARS.intersection(pattern[:-1])):
+                _trie_insert(self._prefix_trie, pattern[:-1])
+            else:
+                general.append(pattern)
+        self._suffixes = tuple(suffixes)
+        self._regex = None
+        if general:
+            self._regex = re.compile(
+                "|".join(f"(?:{fnmatch.translate(p)})" for p in general)
+            )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def for_patterns(patterns: Tuple[str, ...]) -> "GlobMatcher":
+        """Get a shared matcher for a tuple of patterns, compiling it once."""
+        return GlobMatcher(list(patterns))
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def matches(self, filename_lower: str) -> bool:
+        """Check if an already lowercased filename matches any of the patterns."""
+        if filename_lower in self._exact:
+            return True
+        if self._suffixes and filename_lower.endswith(self._suffixes):
+            return True
+        if self._prefix_trie and _trie_has_prefix_of(self._prefix_trie, filename_lower):
+            return True
+        return self._regex is not None and self._regex.match(filename_lower) is not None
+
+
 @dataclass
 class FileFilter:
     """Represents a file filter pattern."""
@@ -62,6 +146,16 @@ class FileFilter:
             is_default=False
         )
 
+    @functools.cached_property
+    def include_matcher(self) -> GlobMatcher:
+        """Compiled include patterns, shared by every view using the filter."""
+        return GlobMatcher.for_patterns(tuple(self.include_patterns))
+
+    @functools.cached_property
+    def exclude_matcher(self) -> GlobMatcher:
+        """Compiled exclude patterns, shared by every view using the filter."""
+        return GlobMatcher.for_patterns(tuple(self.exclude_patterns))
+
     def matches(self, file_path: str) -> bool:
         """Check if a file path matches this filter."""
         filename = os.path.basename(file_path)
@@ -218,10 +312,13 @@ def get_filters_path() -> str:
     return os.path.join(app_data_dir, "filters.json")
 
 
-def save_config(config: AppConfig) -> None:
-    """Save configuration to file."""
-    config_path = get_config_path()
-    config_dict = {
+# Serializes writers so a background save never interleaves with another one.
+_config_write_lock = threading.Lock()
+
+
+def config_to_dict(config: AppConfig) -> dict:
+    """Snapshot configuration into a JSON-serializable dict."""
+    return {
         "window_width": config.window_width,
         "window_height": config.window_height,
         "window_x": config.window_x,
@@ -254,8 +351,24 @@ def save_config(config: AppConfig) -> None:
         "backup_extension": config.backup_extension,
     }
 
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config_dict, f, indent=2)
+
+def write_config_dict(config_dict: dict) -> None:
+    """Write a configuration snapshot to file.
+
+    Safe to call from any thread: the file is replaced atomically under a
+    lock, so readers never see a partially written config.
+    """
+    config_path = get_config_path()
+    temp_path = config_path + ".tmp"
+    with _config_write_lock:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(config_dict, f, indent=2)
+        os.replace(temp_path, config_path)
+
+
+def save_config(config: AppConfig) -> None:
+    """Save configuration to file."""
+    write_config_dict(config_to_dict(config))
 
 
 def load_config() -> AppConfig:
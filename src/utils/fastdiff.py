@@ -0,0 +1,111 @@
+"""
+Fast byte-level comparison of binary data.
+
+Used by the hex view to find differing bytes without a Python-level loop
+over every byte: equal blocks are skipped with a single C-level slice
+comparison and only differing blocks are inspected further. The image
+view thresholds per-pixel channel differences the same way, with
+``bytes.translate`` and strided slices instead of a loop over pixels.
+"""
+
+import functools
+from typing import List, Optional, Tuple
+
+
+# Bytes compared per memcmp block when scanning for differences.
+DIFF_SCAN_BLOCK = 4096
+
+# Lowest bit of every byte of a full block, as a little-endian integer.
+_BLOCK_LOW_BITS = int.from_bytes(b"\x01" * DIFF_SCAN_BLOCK, "little")
+
+
+def byte_diff_positions(left: bytes, right: bytes,
+                        limit: Optional[int] = None) -> List[int]:
+    """Return the sorted offsets at which two byte strings differ.
+
+    Equal blocks are skipped with a single slice comparison, so only the
+    blocks that actually differ are walked byte by byte. Offsets past the
+    end of the shorter input always count as differences. At most
+    ``limit`` offsets are returned when a limit is given.
+    """
+    common = min(len(left), len(right))
+    max_len = max(len(left), len(right))
+    if limit is None:
+        limit = max_len
+    positions = []
+    for start in range(0, common, DIFF_SCAN_BLOCK):
+        if len(positions) >= limit:
+            return positions[:limit]
+        end = min(start + DIFF_SCAN_BLOCK, common)
+        left_block = left[start:end]
+        right_block = right[start:end]
+        if left_block == right_block:
+            continue
+        positions.extend(
+            start + offset
+            for offset, (a, b) in enumerate(zip(left_block, right_block))
+            if a != b
+        )
+    positions.extend(range(common, min(max_len, common + limit)))
+    return positions[:limit]
+
+
+def count_byte_diffs(left: bytes, right: bytes) -> int:
+    """Count the offsets at which two byte strings differ.
+
+    Differing blocks are XORed as big integers and each byte is folded
+    down to its lowest bit, so the count never loops over single bytes.
+    """
+    common = min(len(left), len(right))
+    total = max(len(left), len(right)) - common
+    for start in range(0, common, DIFF_SCAN_BLOCK):
+        end = min(start + DIFF_SCAN_BLOCK, common)
+        left_block = left[start:end]
+        right_block = right[start:end]
+        if left_block == right_block:
+            continue
+        x = (int.from_bytes(left_block, "little")
+             ^ int.from_bytes(right_block, "little"))
+        x |= x >> 4
+        x |= x >> 2
+        x |= x >> 1
+        # Bits beyond the block are zero in x, so the full-block mask fits
+        # a shorter final block as well. int.bit_count needs Python 3.10.
+        total += bin(x & _BLOCK_LOW_BITS).count("1")
+    return total
+
+
+def scan_byte_diffs(left: bytes, right: bytes,
+                    limit: int) -> Tuple[List[int], int]:
+    """Return up to ``limit`` differing offsets and the total difference count."""
+    if not left or not right:
+        return [], 0
+    positions = byte_diff_positions(left, right, limit)
+    if len(positions) < limit:
+        return positions, len(positions)
+    return positions, count_byte_diffs(left, right)
+
+
+@functools.lru_cache(maxsize=256)
+def _threshold_table(threshold: int) -> bytes:
+    """Return a translate table mapping bytes above ``threshold`` to 1, others to 0."""
+    return bytes(1 if value > threshold else 0 for value in range(256))
+
+
+def pixel_diff_flags(channel_diffs: bytes, threshold: int) -> bytes:
+    """Flag the 32-bit pixels whose colour channels differ by more than ``threshold``.
+
+    ``channel_diffs`` holds absolute per-channel differences laid out as
+    ARGB32 pixels (blue, green, red, alpha in memory); the alpha byte is
+    ignored. Returns one byte per pixel, 1 where any colour channel exceeds
+    the threshold and 0 elsewhere.
+
+    The buffer is split into contiguous blue, green and red planes first,
+    so the alpha bytes are never thresholded and each plane is translated
+    as one stream.
+    """
+    table = _threshold_table(threshold)
+    flags = 0
+    for channel in range(3):
+        flags |= int.from_bytes(channel_diffs[channel::4].translate(table), "little")
+    return flags.to_bytes(len(channel_diffs) // 4, "little")
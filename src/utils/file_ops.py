@@ -4,7 +4,9 @@ File operations utilities.
 
 import os
 import shutil
+import tempfile
 from datetime import datetime
+from itertools import accumulate
 from typing import Optional, List, Tuple, Dict, Any
 import codecs
 
@@ -12,6 +14,13 @@ import codecs
 # Common encodings to try in order of likelihood
 COMMON_ENCODINGS = ["utf-8", "utf-8-sig", "latin-1", "cp1252", "gbk", "shift_jis", "euc-kr"]
 
+# Size of each os.write() call in write_file_direct
+WRITE_CHUNK_SIZE = 1 << 20
+
+# Undo deltas whose changed span exceeds this many characters are stored
+# as per-line hunks instead of a single splice.
+DELTA_LINE_HUNK_THRESHOLD = 4096
+
 
 def read_file(file_path: str, encoding: str = "utf-8") -> str:
     """Read a file and return its contents."""
@@ -58,6 +67,47 @@ def write_file(file_path: str, content: str, encoding: str = "utf-8") -> None:
         f.write(content)
 
 
+def write_file_direct(file_path: str, content: str, encoding: str = "utf-8") -> None:
+    """Write content to a file with one encode and unbuffered writes.
+    
+    Bypasses the buffered text layer, which is noticeably slower for very
+    large contents. Newlines are translated to os.linesep, as text mode does.
+    """
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    view = memoryview(content.encode(encoding))
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        while view:
+            written = os.write(fd, view[:WRITE_CHUNK_SIZE])
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def write_bytes_replace(file_path: str, data) -> None:
+    """Write bytes to a new file and move it over ``file_path``.
+
+    The existing file is replaced rather than truncated, so memory maps of
+    it (e.g. a hex view of the same file) keep seeing the old contents
+    instead of faulting. An existing file's permission bits are kept.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 def write_file_with_encoding(
     file_path: str, 
     content: str, 
@@ -284,6 +334,7 @@ def merge_files(
 
 # For backward compatibility with imports
 from src.diff_engine import DiffResult, DirectoryDiffResult
+from src.diff_engine import common_prefix_length, common_suffix_length, trimmed_opcodes
 
 
 class UndoRedoManager:
@@ -291,6 +342,15 @@ class UndoRedoManager:
     
     Stores snapshots of content at each significant edit point,
     allowing users to undo/redo merge changes.
+    
+    Only the current left/right content is kept in full. Each history
+    entry stores a delta per side against the entry below it: a tuple of
+    ``(start, removed, inserted)`` hunks, with ``start`` counted in the
+    older text. Small edits are a single splice between the common prefix
+    and suffix; larger ones are split into line hunks so that scattered
+    changes do not store the unchanged text between them. Memory therefore
+    grows with the size of the edits rather than the size of the documents,
+    and each undo/redo applies exactly one delta.
     """
     
     def __init__(self, max_history: int = 50):
@@ -302,6 +362,70 @@ class UndoRedoManager:
         self._undo_stack: List[Dict[str, Any]] = []
         self._redo_stack: List[Dict[str, Any]] = []
         self._max_history = max_history
+        self._left_content = ""
+        self._right_content = ""
+    
+    @staticmethod
+    def _make_delta(old: str, new: str) -> Tuple[Tuple[int, str, str], ...]:
+        """Compute the hunks that turn ``old`` into ``new``."""
+        prefix = common_prefix_length(old, new)
+        suffix = common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+        removed = old[prefix:len(old) - suffix]
+        inserted = new[prefix:len(new) - suffix]
+        if not removed and not inserted:
+            return ()
+        if len(removed) + len(inserted) <= DELTA_LINE_HUNK_THRESHOLD:
+            return ((prefix, removed, inserted),)
+        
+        old_lines = removed.splitlines(keepends=True)
+        new_lines = inserted.splitlines(keepends=True)
+        old_offsets = list(accumulate((len(line) for line in old_lines), initial=prefix))
+        return tuple(
+            (old_offsets[i1], "".join(old_lines[i1:i2]), "".join(new_lines[j1:j2]))
+            for tag, i1, i2, j1, j2 in trimmed_opcodes(old_lines, new_lines)
+            if tag != "equal"
+        )
+    
+    @staticmethod
+    def _apply_delta(content: str, delta: Tuple[Tuple[int, str, str], ...]) -> str:
+        """Apply a delta forwards (redo direction)."""
+        if not delta:
+            return content
+        pieces = []
+        pos = 0
+        for start, removed, inserted in delta:
+            pieces.append(content[pos:start])
+            pieces.append(inserted)
+            pos = start + len(removed)
+        pieces.append(content[pos:])
+        return "".join(pieces)
+    
+    @staticmethod
+    def _revert_delta(content: str, delta: Tuple[Tuple[int, str, str], ...]) -> str:
+        """Apply a delta backwards (undo direction)."""
+        if not delta:
+            return content
+        pieces = []
+        pos = 0
+        shift = 0
+        for start, removed, inserted in delta:
+            start += shift
+            pieces.append(content[pos:start])
+            pieces.append(removed)
+            pos = start + len(inserted)
+            shift += len(inserted) - len(removed)
+        pieces.append(content[pos:])
+        return "".join(pieces)
+    
+    def _materialize(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the full snapshot dict for the entry at the current state."""
+        return {
+            "action_type": entry["action_type"],
+            "left_content": self._left_content,
+            "right_content": self._right_content,
+            "description": entry["description"],
+            "timestamp": entry["timestamp"]
+        }
     
     def snapshot(
         self, 
@@ -318,18 +442,21 @@ class UndoRedoManager:
             right_content: Current right pane content
             description: Human-readable description of the action
         """
-        snapshot = {
+        entry = {
             "action_type": action_type,
-            "left_content": left_content,
-            "right_content": right_content,
+            "left_delta": self._make_delta(self._left_content, left_content),
+            "right_delta": self._make_delta(self._right_content, right_content),
             "description": description,
             "timestamp": datetime.now().isoformat()
         }
+        self._left_content = left_content
+        self._right_content = right_content
         
-        self._undo_stack.append(snapshot)
+        self._undo_stack.append(entry)
         self._redo_stack.clear()  # Clear redo stack on new action
         
-        # Trim history if needed
+        # Trim history if needed. Older entries only hold deltas against
+        # the entry below them, so dropping the oldest one is safe.
         if len(self._undo_stack) > self._max_history:
             self._undo_stack.pop(0)
     
@@ -350,12 +477,14 @@ class UndoRedoManager:
         if not self.can_undo():
             return None
         
-        snapshot = self._undo_stack.pop()
-        self._redo_stack.append(snapshot)
+        entry = self._undo_stack.pop()
+        self._redo_stack.append(entry)
+        self._left_content = self._revert_delta(self._left_content, entry["left_delta"])
+        self._right_content = self._revert_delta(self._right_content, entry["right_delta"])
         
         # Return the state before the undo (second-to-last if exists)
         if self._undo_stack:
-            return self._undo_stack[-1]
+            return self._materialize(self._undo_stack[-1])
         return None
     
     def redo(self) -> Optional[Dict[str, Any]]:
@@ -367,9 +496,11 @@ class UndoRedoManager:
         if not self.can_redo():
             return None
         
-        snapshot = self._redo_stack.pop()
-        self._undo_stack.append(snapshot)
-        return snapshot
+        entry = self._redo_stack.pop()
+        self._undo_stack.append(entry)
+        self._left_content = self._apply_delta(self._left_content, entry["left_delta"])
+        self._right_content = self._apply_delta(self._right_content, entry["right_delta"])
+        return self._materialize(entry)
     
     def get_undo_description(self) -> str:
         """Get description of the next action to undo."""
@@ -387,6 +518,8 @@ class UndoRedoManager:
         """Clear all history."""
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._left_content = ""
+        self._right_content = ""
     
     def get_history_count(self) -> Tuple[int, int]:
         """Get the number of undo and redo entries."""
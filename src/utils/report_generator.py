@@ -10,6 +10,10 @@ from datetime import datetime
 from src.diff_engine import DiffResult, DiffType
 
 
+# strftime format of the generation time in HTML and text reports.
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
 class ReportGenerator:
     """Generator for various report formats."""
 
@@ -18,9 +22,10 @@ class ReportGenerator:
                           left_path: str = "", 
                           right_path: str = "",
                           left_content: str = "",
-                          right_content: str = "") -> str:
+                          right_content: str = "",
+                          generated_at: Optional[datetime] = None) -> str:
         """Generate an HTML report of the diff."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = (generated_at or datetime.now()).strftime(TIMESTAMP_FORMAT)
         
         left_display = left_path or "N/A"
         right_display = right_path or "N/A"
@@ -206,7 +211,8 @@ class ReportGenerator:
     @staticmethod
     def generate_text_report(diff_result: DiffResult,
                           left_path: str = "",
-                          right_path: str = "") -> str:
+                          right_path: str = "",
+                          generated_at: Optional[datetime] = None) -> str:
         """Generate a text report of the diff."""
         lines = []
         lines.append("=" * 80)
@@ -214,7 +220,7 @@ class ReportGenerator:
         lines.append("=" * 80)
         lines.append(f"Left File:  {left_path or 'N/A'}")
         lines.append(f"Right File: {right_path or 'N/A'}")
-        lines.append(f"Generated:  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append(f"Generated:  {(generated_at or datetime.now()).strftime(TIMESTAMP_FORMAT)}")
         lines.append("")
         lines.append("-" * 80)
         lines.append(f"Total Lines: {diff_result.left_line_count} (left) / {diff_result.right_line_count} (right)")
@@ -243,8 +249,13 @@ class ReportGenerator:
                                    left_path: str = "",
                                    right_path: str = "",
                                    left_content: str = "",
-                                   right_content: str = "") -> str:
-        """Generate a unified diff format report."""
+                                   right_content: str = "",
+                                   generated_at: Optional[datetime] = None) -> str:
+        """Generate a unified diff format report.
+
+        The format has no header for ``generated_at``; it is accepted so all
+        generators can be called the same way.
+        """
         lines = []
         lines.append(f"--- {left_path or 'left'}")
         lines.append(f"+++ {right_path or 'right'}")
@@ -268,11 +279,12 @@ class ReportGenerator:
                           left_path: str = "",
                           right_path: str = "",
                           left_content: str = "",
-                          right_content: str = "") -> str:
+                          right_content: str = "",
+                          generated_at: Optional[datetime] = None) -> str:
         """Generate a JSON report of the diff."""
         report = {
             "metadata": {
-                "generated": datetime.now().isoformat(),
+                "generated": (generated_at or datetime.now()).isoformat(),
                 "left_file": left_path,
                 "right_file": right_path,
                 "left_line_count": diff_result.left_line_count,
@@ -295,6 +307,26 @@ class ReportGenerator:
         
         return json.dumps(report, indent=2, ensure_ascii=False)
 
+    @staticmethod
+    def restamp_report(report: str, generated_at: datetime, now: datetime) -> str:
+        """Change the generation time of a report made by this class.
+
+        Lets a cached report be written again with the time it is exported
+        at. Each timestamp is replaced together with the header text around
+        it, and only once, so the same text in file paths or content is
+        left alone.
+        """
+        old, new = generated_at.strftime(TIMESTAMP_FORMAT), now.strftime(TIMESTAMP_FORMAT)
+        old_iso, new_iso = generated_at.isoformat(), now.isoformat()
+        for template, before, after in (
+            ("<title>Diff Report - {}</title>", old, new),
+            ("<strong>Generated:</strong> {}<br>", old, new),
+            ("\nGenerated:  {}\n", old, new),
+            ('"generated": "{}"', old_iso, new_iso),
+        ):
+            report = report.replace(template.format(before), template.format(after), 1)
+        return report
+
     @staticmethod
     def save_report(content: str, file_path: str) -> bool:
         """Save report content to a file."""
@@ -0,0 +1,65 @@
+"""
+Tests for configuration utilities.
+"""
+
+import fnmatch
+import os
+from src.utils.config import (
+    AppConfig, FileFilter, GlobMatcher, config_to_dict, get_config_path,
+    load_config, save_config
+)
+
+
+class TestGlobMatcher:
+    """Test cases for GlobMatcher."""
+
+    NAMES = [
+        "a.py", "x.pyc", "__pycache__", "readme.md", "test_x.txt",
+        "b.cpp", "noext", "tmp123", "a.py.bak", ".hidden", "xa.py",
+    ]
+
+    def test_matches_like_fnmatch(self):
+        """Test that every pattern bucket agrees with fnmatch."""
+        pattern_sets = [
+            ["*.py", "*.pyw"],
+            ["test_*", "tmp*"],
+            ["readme.md", "*.py"],
+            ["?a.py", "[ab].cpp", "*.py*"],
+            ["*"],
+        ]
+        for patterns in pattern_sets:
+            matcher = GlobMatcher(patterns)
+            for name in self.NAMES:
+                expected = any(fnmatch.fnmatchcase(name, p) for p in patterns)
+                assert matcher.matches(name) == expected, (patterns, name)
+
+    def test_patterns_are_case_insensitive(self):
+        """Test that uppercase patterns match lowercased names."""
+        matcher = GlobMatcher(["*.PY", "README*"])
+        assert matcher.matches("a.py")
+        assert matcher.matches("readme.txt")
+
+    def test_empty_matcher_is_falsy(self):
+        """Test that a matcher without patterns matches nothing."""
+        matcher = GlobMatcher([])
+        assert not matcher
+        assert not matcher.matches("a.py")
+
+    def test_filters_share_compiled_matchers(self):
+        """Test that equal filters reuse one compiled matcher."""
+        first = FileFilter.python_only_filter()
+        second = FileFilter.python_only_filter()
+        assert first.include_matcher is second.include_matcher
+        assert first.exclude_matcher.matches("x.pyc")
+
+
+class TestSaveConfig:
+    """Test cases for writing the configuration file."""
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        """Test that a saved config loads back unchanged."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        config = AppConfig(window_x=5, window_maximized=True, recent_files=["a.txt"])
+        save_config(config)
+        assert config_to_dict(load_config()) == config_to_dict(config)
+        assert not os.path.exists(get_config_path() + ".tmp")
@@ -5,7 +5,8 @@ Tests for the diff engine.
 import pytest
 import os
 import tempfile
-from src.diff_engine import DiffEngine, DiffResult, DiffType, DiffLine
+from src.diff_engine import DiffEngine, DiffResult, DiffType, DiffLine, IgnoreOptions
+from src.diff_engine import common_prefix_length, common_suffix_length, trimmed_opcodes
 from src.diff_engine import DirectoryDiffEngine, DirectoryDiffEntry, DirectoryDiffResult
 
 
@@ -33,6 +34,18 @@ class TestDiffEngine:
         assert result.change_count > 0
         assert len(result.lines) == 4
     
+    def test_compare_char_level_trims_common_affixes(self):
+        """Test that char-level diff reports shared prefix/suffix as equal."""
+        left = "a" * 500 + "old" + "z" * 500
+        right = "a" * 500 + "new" + "z" * 500
+        
+        result = DiffEngine.compare_char_level(left, right)
+        
+        assert result[0] == ("a" * 500, "a" * 500, "equal")
+        assert result[-1] == ("z" * 500, "z" * 500, "equal")
+        assert "".join(c[0] for c in result) == left
+        assert "".join(c[1] for c in result) == right
+    
     def test_compare_with_insertions(self):
         """Test comparing with insertions."""
         lines1 = ["line1", "line2"]
@@ -101,6 +114,67 @@ class TestDiffResult:
         assert result.left_line_count == 3
         assert result.right_line_count == 3
         assert result.change_count == 1
+    
+    def test_line_indices(self):
+        """Test the per-type and change line indices."""
+        left = ["a", "b", "c"]
+        right = ["a", "x", "c", "d"]
+        
+        result = DiffResult.from_files(left, right)
+        
+        expected_changes = [i for i, line in enumerate(result.lines) if line.is_change]
+        assert result.change_indices() == expected_changes
+        assert result.indices_of(DiffType.EQUAL) == [
+            i for i, line in enumerate(result.lines) if line.type == DiffType.EQUAL
+        ]
+        assert result.indices_of(DiffType.INSERT)
+
+
+class TestIgnoreOptions:
+    """Test cases for the IgnoreOptions class."""
+    
+    def test_as_tuple_is_hashable_and_tracks_options(self):
+        """Test that as_tuple reflects the current option values."""
+        options = IgnoreOptions()
+        before = options.as_tuple()
+        
+        options.ignore_case = True
+        after = options.as_tuple()
+        
+        assert before != after
+        assert hash(after) == hash(IgnoreOptions(ignore_case=True).as_tuple())
+
+
+class TestAffixHelpers:
+    """Test cases for the common prefix/suffix helpers."""
+    
+    def test_common_prefix_length(self):
+        """Test prefix lengths on strings and lists, across scan chunks."""
+        long_text = "x" * 1000
+        assert common_prefix_length("abcdef", "abcxyz") == 3
+        assert common_prefix_length("", "abc") == 0
+        assert common_prefix_length(long_text + "a", long_text + "b") == 1000
+        assert common_prefix_length(["a", "b"], ["a", "b", "c"]) == 2
+    
+    def test_common_suffix_length(self):
+        """Test suffix lengths and the optional limit."""
+        long_text = "x" * 1000
+        assert common_suffix_length("abcdef", "xyzdef") == 3
+        assert common_suffix_length("a" + long_text, "b" + long_text) == 1000
+        assert common_suffix_length(["a", "c"], ["b", "c"]) == 1
+        assert common_suffix_length("aaaa", "aa", limit=1) == 1
+    
+    def test_trimmed_opcodes(self):
+        """Test that opcodes cover both sequences with the affixes as equal."""
+        left = ["a", "b", "c", "d", "e"]
+        right = ["a", "b", "x", "d", "e"]
+        
+        opcodes = trimmed_opcodes(left, right)
+        
+        assert opcodes[0] == ("equal", 0, 2, 0, 2)
+        assert opcodes[-1] == ("equal", 3, 5, 3, 5)
+        assert ("replace", 2, 3, 2, 3) in opcodes
+        assert trimmed_opcodes([], []) == []
 
 
 class TestDirectoryDiffEngine:
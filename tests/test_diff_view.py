@@ -0,0 +1,41 @@
+"""
+Tests for the side-by-side diff view.
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from src.gui.diff_view import DiffView
+
+
+def _app() -> QApplication:
+    """Return the running QApplication, creating one if needed."""
+    return QApplication.instance() or QApplication([])
+
+
+class TestFileLoading:
+    """Test cases for streaming files into the diff view."""
+
+    def _compare(self, app, view, left_path, right_path):
+        """Compare two files and wait until both have loaded."""
+        view.compare_files(left_path, right_path)
+        while view._file_streams:
+            app.processEvents()
+        app.processEvents()
+
+    def test_loading_is_not_undoable(self, tmp_path):
+        """Test that loading files, even twice, records no undo history."""
+        app = _app()
+        left = tmp_path / "left.txt"
+        right = tmp_path / "right.txt"
+        left.write_text("a\nb\n", encoding="utf-8")
+        right.write_text("a\nc\n", encoding="utf-8")
+
+        view = DiffView()
+        self._compare(app, view, str(left), str(right))
+        self._compare(app, view, str(right), str(left))
+
+        assert not view.can_undo()
+        assert view.left_editor.toPlainText() == "a\nc\n"
+        assert view.right_editor.toPlainText() == "a\nb\n"
@@ -0,0 +1,79 @@
+"""
+Tests for byte-level comparison utilities.
+"""
+
+import random
+from src.utils.fastdiff import (
+    DIFF_SCAN_BLOCK, byte_diff_positions, count_byte_diffs, pixel_diff_flags,
+    scan_byte_diffs
+)
+
+
+def random_bytes(rng: random.Random, n: int) -> bytes:
+    """Return ``n`` random bytes (Random.randbytes needs Python 3.9)."""
+    return bytes(rng.getrandbits(8) for _ in range(n))
+
+
+def naive_diff_positions(left: bytes, right: bytes):
+    """Reference implementation comparing one byte at a time."""
+    max_len = max(len(left), len(right))
+    return [
+        i for i in range(max_len)
+        if i >= len(left) or i >= len(right) or left[i] != right[i]
+    ]
+
+
+class TestByteDiff:
+    """Test cases for the byte diff scan."""
+
+    def test_identical_data(self):
+        """Test that identical data has no differences."""
+        data = bytes(range(256)) * 40
+        assert byte_diff_positions(data, data) == []
+        assert count_byte_diffs(data, data) == 0
+
+    def test_matches_naive_scan(self):
+        """Test positions and counts against a byte-by-byte comparison."""
+        rng = random.Random(0)
+        for _ in range(50):
+            left = bytearray(random_bytes(rng, rng.randint(0, 3 * DIFF_SCAN_BLOCK)))
+            right = bytearray(left)
+            for _ in range(rng.randint(0, 10)):
+                if right:
+                    right[rng.randrange(len(right))] ^= rng.randint(1, 255)
+            right = bytes(right[:rng.randint(0, len(right))]) + random_bytes(rng, rng.randint(0, 20))
+            expected = naive_diff_positions(left, right)
+            assert byte_diff_positions(left, right) == expected
+            assert count_byte_diffs(left, right) == len(expected)
+
+    def test_limit(self):
+        """Test that positions stop at the limit while the count is exact."""
+        left = bytes(DIFF_SCAN_BLOCK * 2)
+        right = b"\xff" * (DIFF_SCAN_BLOCK * 2 + 5)
+        positions, total = scan_byte_diffs(left, right, 100)
+        assert positions == list(range(100))
+        assert total == DIFF_SCAN_BLOCK * 2 + 5
+
+    def test_scan_with_empty_side(self):
+        """Test that an empty side yields no differences to highlight."""
+        assert scan_byte_diffs(b"", b"abc", 10) == ([], 0)
+
+
+class TestPixelDiffFlags:
+    """Test cases for thresholding per-pixel channel differences."""
+
+    def test_matches_naive_threshold(self):
+        """Test flags against a pixel-by-pixel channel comparison."""
+        rng = random.Random(1)
+        diffs = random_bytes(rng, 4 * 500)
+        for threshold in (0, 10, 128, 255):
+            expected = bytes(
+                1 if max(diffs[i:i + 3]) > threshold else 0
+                for i in range(0, len(diffs), 4)
+            )
+            assert pixel_diff_flags(diffs, threshold) == expected
+
+    def test_alpha_is_ignored(self):
+        """Test that differences in the alpha byte are not flagged."""
+        diffs = bytes((0, 0, 0, 255, 0, 0, 11, 0))
+        assert pixel_diff_flags(diffs, 10) == bytes((0, 1))
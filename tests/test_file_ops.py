@@ -6,7 +6,7 @@ import pytest
 import os
 import tempfile
 from src.utils.file_ops import (
-    read_file, write_file, create_backup, 
+    read_file, write_file, write_file_direct, write_bytes_replace, create_backup, 
     get_file_info, compare_directories,
     read_file_with_encoding_detection, write_file_with_encoding,
     merge_files, UndoRedoManager, MergeResult
@@ -28,6 +28,41 @@ class TestFileOperations:
         finally:
             os.unlink(temp_path)
     
+    def test_write_file_direct(self):
+        """Test unbuffered writing, including contents larger than one chunk."""
+        content = "line é\n" * 300000
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "out.txt")
+            with open(temp_path, "w") as f:
+                f.write("old content that is longer than the new one" * 100000)
+            
+            write_file_direct(temp_path, content)
+            
+            with open(temp_path, "r", encoding="utf-8") as f:
+                assert f.read() == content
+    
+    @pytest.mark.skipif(os.name == "nt", reason="Windows cannot replace a mapped file")
+    def test_write_bytes_replace_keeps_mapped_file(self):
+        """Test that replacing a mapped file leaves the existing map readable."""
+        import mmap
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = os.path.join(temp_dir, "data.bin")
+            with open(temp_path, "wb") as f:
+                f.write(b"old data" * 1000)
+            os.chmod(temp_path, 0o600)
+            with open(temp_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                write_bytes_replace(temp_path, b"new")
+                assert mapped[:8] == b"old data"
+                assert mapped[-8:] == b"old data"
+            finally:
+                mapped.close()
+            with open(temp_path, "rb") as f:
+                assert f.read() == b"new"
+            assert os.stat(temp_path).st_mode & 0o777 == 0o600
+            assert os.listdir(temp_dir) == ["data.bin"]
+    
     def test_read_file_encoding(self):
         """Test reading files with different encodings."""
         with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
@@ -344,3 +379,53 @@ class TestUndoRedoManager:
         
         undo_count, _ = manager.get_history_count()
         assert undo_count == 3  # Should be limited to max_history
+    
+    def test_undo_redo_restores_content(self):
+        """Test that content round-trips through undo and redo."""
+        manager = UndoRedoManager(max_history=3)
+        versions = [("a\nb\nc", "x"), ("a\nB\nc", "x"), ("a\nB\nc\nd", "xy"), ("", "xy"), ("q", "")]
+        
+        for i, (left, right) in enumerate(versions):
+            manager.snapshot("edit", left, right, f"Version {i}")
+        
+        restored = manager.undo()
+        assert restored["left_content"] == versions[3][0]
+        assert restored["right_content"] == versions[3][1]
+        
+        restored = manager.undo()
+        assert restored["left_content"] == versions[2][0]
+        assert restored["right_content"] == versions[2][1]
+        
+        restored = manager.redo()
+        assert restored["left_content"] == versions[3][0]
+        restored = manager.redo()
+        assert restored["left_content"] == versions[4][0]
+        assert restored["right_content"] == versions[4][1]
+        assert restored["description"] == "Version 4"
+    
+    def test_scattered_edit_round_trips(self):
+        """Test that a large edit touching distant lines undoes and redoes exactly."""
+        manager = UndoRedoManager()
+        original = "".join(f"line {i}\n" for i in range(5000))
+        edited = "first\n" + original[len("line 0\n"):-len("line 4999\n")] + "last\n"
+        further = edited.replace("line 2500\n", "middle\n")
+        
+        manager.snapshot("edit", original, "", "Load")
+        manager.snapshot("edit", edited, original, "Edit both ends")
+        manager.snapshot("edit", further, edited, "Edit the middle")
+        
+        restored = manager.undo()
+        assert restored["left_content"] == edited
+        assert restored["right_content"] == original
+        restored = manager.undo()
+        assert restored["left_content"] == original
+        assert restored["right_content"] == ""
+        assert manager.can_redo()
+        
+        restored = manager.redo()
+        assert restored["left_content"] == edited
+        assert restored["right_content"] == original
+        restored = manager.redo()
+        assert restored["left_content"] == further
+        assert restored["right_content"] == edited
+        assert not manager.can_redo()
@@ -0,0 +1,42 @@
+"""
+Tests for report generation.
+"""
+
+from datetime import datetime
+from src.diff_engine import DiffEngine
+from src.utils.report_generator import ReportGenerator
+
+
+class TestRestampReport:
+    """Test cases for changing the generation time of a cached report."""
+
+    FIRST = datetime(2024, 1, 2, 3, 4, 5)
+    LATER = datetime(2024, 6, 7, 8, 9, 10)
+
+    def _diff(self):
+        """Build a small diff to report on."""
+        return DiffEngine.compare_lines(["a", "b", "c"], ["a", "x", "c", "d"])
+
+    def test_matches_fresh_report(self):
+        """Test that a restamped report equals one generated at the new time."""
+        diff = self._diff()
+        generators = [
+            lambda at: ReportGenerator.generate_html_report(diff, "l.txt", "r.txt", generated_at=at),
+            lambda at: ReportGenerator.generate_text_report(diff, "l.txt", "r.txt", generated_at=at),
+            lambda at: ReportGenerator.generate_json_report(diff, "l.txt", "r.txt", generated_at=at),
+            lambda at: ReportGenerator.generate_unified_diff_report(diff, "l.txt", "r.txt", generated_at=at),
+        ]
+        for generate in generators:
+            cached = generate(self.FIRST)
+            restamped = ReportGenerator.restamp_report(cached, self.FIRST, self.LATER)
+            assert restamped == generate(self.LATER)
+
+    def test_paths_are_left_alone(self):
+        """Test that a timestamp inside a file path is not replaced."""
+        diff = self._diff()
+        path = f"Generated:  {self.FIRST.strftime('%Y-%m-%d %H:%M:%S')}"
+        cached = ReportGenerator.generate_text_report(diff, path, "r.txt", generated_at=self.FIRST)
+        restamped = ReportGenerator.restamp_report(cached, self.FIRST, self.LATER)
+        assert restamped == ReportGenerator.generate_text_report(
+            diff, path, "r.txt", generated_at=self.LATER
+        )